@@ -0,0 +1,144 @@
+"""
+Benchmark: duplicate / labeling-tool preprocessing and the resume scan of
+logical_repo_checks.main, row-by-row (previous implementation) vs. the column
+operations in src/sheet_index.py, on a synthetic sheet.
+
+Usage: python benchmarks/bench_preprocess_duplicates.py [rows]   (default 100000)
+
+Both versions are checked to mark the same rows and find the same
+unprocessed rows before timings are reported.
+"""
+
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sheet_index import mark_duplicates, unprocessed_row_indices  # noqa: E402
+
+# Default column layout of logical_repo_checks.COLUMN_CONFIG
+COLUMN_INDICES = {
+    'user_repo': 0, 'repo_url': 2, 'majority_language': 3, 'percentage': 4, 'stars': 5, 'loc': 6,
+    'already_exists': 7, 'logical_checks': 8, 'added': 14,
+}
+NUM_COLUMNS = 19
+DUPLICATE_RATE = 0.1  # Share of rows that repeat an earlier repo
+LT_RATE = 0.05  # Share of distinct repos already in the labeling tool
+PROCESSED_RATE = 0.6  # Share of rows that already have a Logical Checks verdict
+
+
+def make_sheet(rows, seed=0):
+    """Build a sheet DataFrame shaped like fetch_sheet_data's output, plus a labeling-tool repo set."""
+    rng = random.Random(seed)
+    repos = []
+    for i in range(rows):
+        if repos and rng.random() < DUPLICATE_RATE:
+            repo = rng.choice(repos)
+            # Repeats differ in case/whitespace like hand-pasted sheet rows do
+            repo = repo.upper() if rng.random() < 0.5 else repo
+        else:
+            repo = f"owner{i % 5000}/repo{i}"
+        repos.append(repo)
+
+    data = []
+    for repo in repos:
+        row = [''] * NUM_COLUMNS
+        row[COLUMN_INDICES['user_repo']] = repo
+        row[COLUMN_INDICES['repo_url']] = f" https://github.com/{repo}" if rng.random() < 0.1 else f"https://github.com/{repo}"
+        if rng.random() < PROCESSED_RATE:
+            row[COLUMN_INDICES['logical_checks']] = rng.choice(['Yes', 'No', 'Manual'])
+            row[COLUMN_INDICES['already_exists']] = rng.choice(['Yes', 'No'])
+        data.append(row)
+
+    distinct = sorted({repo.lower() for repo in repos})
+    existing_lt_repos = set(rng.sample(distinct, int(len(distinct) * LT_RATE)))
+    df = pd.DataFrame(data, columns=[f'col_{i}' for i in range(NUM_COLUMNS)])
+    return df, existing_lt_repos
+
+
+# --- Previous implementation (preprocess_duplicates + main steps 6 and 7, prints removed) ---
+
+def legacy_preprocess(df, column_indices, existing_lt_repos):
+    already_exists_col_name = f"col_{column_indices['already_exists']}"
+    logical_checks_col_name = f"col_{column_indices['logical_checks']}"
+    user_repo_col_idx = column_indices['user_repo']
+
+    df_copy = df.copy()
+    normalized_urls = df_copy[f"col_{column_indices['repo_url']}"].str.lower().str.strip()
+    duplicate_mask = normalized_urls.duplicated(keep='first')
+    duplicate_mask &= normalized_urls != ""
+
+    for idx, row in df_copy.iterrows():
+        user_repo_val = row.iloc[user_repo_col_idx] if user_repo_col_idx < len(row) else ''
+        if isinstance(user_repo_val, str) and '/' in user_repo_val.strip():
+            if user_repo_val.strip().lower() in existing_lt_repos:
+                df_copy.loc[idx, already_exists_col_name] = "Yes"
+                df_copy.loc[idx, logical_checks_col_name] = "No"
+
+    if duplicate_mask.sum() > 0:
+        df_copy.loc[duplicate_mask, already_exists_col_name] = "Yes"
+        df_copy.loc[duplicate_mask, logical_checks_col_name] = "No"
+
+    # Step 6: every row now flagged Yes/No is written, changed or not
+    duplicate_rows = df_copy[(df_copy[already_exists_col_name] == "Yes") & (df_copy[logical_checks_col_name] == "No")]
+    cell_updates = []
+    for idx, row in duplicate_rows.iterrows():
+        cell_updates.extend([
+            (idx + 2, column_indices['already_exists'] + 1, "Yes"),
+            (idx + 2, column_indices['logical_checks'] + 1, "No"),
+        ])
+    return df_copy, cell_updates
+
+
+def legacy_unprocessed(df, column_indices):
+    unprocessed_rows = []
+    user_repo_col_idx = column_indices['user_repo']
+    logical_checks_col_idx = column_indices['logical_checks']
+    for index, row in df.iterrows():
+        user_repo_val = row.iloc[user_repo_col_idx] if user_repo_col_idx < len(row) else ''
+        logical_check_val = row.iloc[logical_checks_col_idx] if logical_checks_col_idx < len(row) else ''
+        user_repo_present = isinstance(user_repo_val, str) and '/' in user_repo_val.strip()
+        logical_check_empty = pd.isna(logical_check_val) or str(logical_check_val).strip() == ''
+        if user_repo_present and logical_check_empty:
+            unprocessed_rows.append(index)
+    return unprocessed_rows
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df, existing_lt_repos = make_sheet(rows)
+    print(f"Synthetic sheet: {rows:,} rows, {len(existing_lt_repos):,} repos in the labeling tool")
+
+    (legacy_df, legacy_cells), legacy_mark_time = timed(legacy_preprocess, df, COLUMN_INDICES, existing_lt_repos)
+    legacy_rows, legacy_scan_time = timed(legacy_unprocessed, legacy_df, COLUMN_INDICES)
+
+    (new_df, _, _, changed_cells), new_mark_time = timed(mark_duplicates, df, COLUMN_INDICES, existing_lt_repos)
+    new_rows, new_scan_time = timed(unprocessed_row_indices, new_df, COLUMN_INDICES)
+
+    flag_columns = [f"col_{COLUMN_INDICES['already_exists']}", f"col_{COLUMN_INDICES['logical_checks']}"]
+    assert legacy_df[flag_columns].equals(new_df[flag_columns]), "marked rows differ"
+    assert legacy_rows == new_rows, "unprocessed rows differ"
+
+    print(f"{'':28}{'row-by-row':>12}{'columnar':>12}{'speedup':>10}")
+    for label, old, new in (
+        ('duplicate + LT marking', legacy_mark_time, new_mark_time),
+        ('unprocessed-row scan', legacy_scan_time, new_scan_time),
+        ('total', legacy_mark_time + legacy_scan_time, new_mark_time + new_scan_time),
+    ):
+        print(f"{label:28}{old:>11.3f}s{new:>11.3f}s{old / new:>9.1f}x")
+    print(f"Cells written to the sheet: {len(legacy_cells):,} before, {len(changed_cells):,} now (diff only)")
+    print(f"Unprocessed rows: {len(new_rows):,}")
+
+
+if __name__ == '__main__':
+    main()
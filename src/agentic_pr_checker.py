@@ -4,8 +4,9 @@ import time
 import json
 import re
 import csv
+import threading
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
@@ -16,6 +17,16 @@ from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
 from termcolor import colored
 
+from github_client import github_get
+from github_graphql import GraphQLError, fetch_merged_prs
+from pr_hydration import hydrate_prs
+from pr_search import search_merged_prs
+from pr_watermarks import (
+    get_agent_decisions, get_watermark, load_repo_state, merge_classified_prs,
+    record_agent_decisions, relevant_prs_from_state, save_repo_state
+)
+from rate_limiter import PRIORITY_INTERACTIVE, format_status, get_rate_limit_status, set_default_priority
+
 # --- Configuration ---
 # load_dotenv()
 
@@ -28,9 +39,15 @@ DEBUG_REPO_URL = "https://github.com/keras-team/keras"
 TARGET_GOOD_PRS = 2
 LLM_MODEL = "gpt-4o-mini"  # Changed to GPT-4o mini
 MERGED_AFTER_DATE = datetime.fromisoformat('2024-11-01T00:00:00+00:00')
+FETCH_MODE = "rest"  # "rest" (/pulls listing), "graphql" (bulk PRs + issues + files per query) or "search" (merged-only search listing)
+PARALLEL_PAGE_FETCH = True  # REST mode: fetch /pulls pages concurrently using the Link header
+PAGE_FETCH_WORKERS = 8  # Concurrent /pulls page requests
+INCREMENTAL_MODE = False  # Only fetch PRs updated since the last run and merge with stored results (--incremental)
 
 # --- Parallel Processing Configuration ---
 ENABLE_PARALLEL_PROCESSING = True
+ASYNC_HYDRATION = True  # REST mode: fetch issues and files for many PRs concurrently
+HYDRATION_CONCURRENCY = 16  # PRs hydrated at once; the rate-limit scheduler still paces every request
 MAX_WORKERS = 4  # Number of parallel workers for agentic checks
 PR_PROCESSING_THRESHOLD = 1.0  # Default 100% - process all PRs that passed logical checks
 
@@ -47,7 +64,8 @@ SPREADSHEET_KEY = get_spreadsheet_key()
 # Language-specific configurations for agentic PR checks
 from config_utils import (
     get_language_config, get_language_sheet_name, get_language_target_language,
-    get_source_extensions, get_dependency_files, get_all_languages
+    get_source_extensions, get_dependency_files,
+    get_other_source_extensions, get_test_patterns
 )
 
 # Get current language configuration
@@ -90,18 +108,6 @@ except (FileNotFoundError, KeyError):
     UNIVERSAL_TEST_EXT = {'.snap', '.spec'}
     TEST_DIRECTORIES = ['/test/', '/tests/', '/spec/']
 
-# Build one big set with _all_ source extensions so we can identify disallowed ones
-# dynamically. This ensures that when LANGUAGE = "Java", any .py or .ts files will
-# be flagged automatically without maintaining a bespoke disallowed list.
-ALL_SOURCE_EXT = set()
-try:
-    all_languages = get_all_languages()
-    for lang_name in all_languages.keys():
-        ALL_SOURCE_EXT.update(get_source_extensions(lang_name))
-except (FileNotFoundError, KeyError):
-    # Fallback to basic extensions if config file is not available
-    ALL_SOURCE_EXT = {'.java', '.js', '.jsx', '.ts', '.tsx', '.py', '.go', '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hh', '.hxx', '.rs'}
-
 
 def is_english(text):
     """
@@ -163,7 +169,6 @@ def _is_test_file(filepath: str, lang_name: str) -> bool:
     
     # Language-specific test patterns
     try:
-        from config_utils import get_test_patterns
         test_patterns = get_test_patterns(lang_name)
         if any(base.endswith(pattern) or base.startswith(pattern) for pattern in test_patterns):
             return True
@@ -206,9 +211,12 @@ def print_language_configuration():
     print("PROCESSING CONFIGURATION")
     print("-" * 80)
     print(f"LLM Model: {LLM_MODEL}")
+    print(f"PR Fetch Mode: {FETCH_MODE}")
+    print(f"Incremental Mode: {'Enabled' if INCREMENTAL_MODE else 'Disabled'}")
     print(f"Target Good PRs: {TARGET_GOOD_PRS}")
     print(f"Parallel Processing: {'Enabled' if ENABLE_PARALLEL_PROCESSING else 'Disabled'}")
     print(f"Max Workers: {MAX_WORKERS}")
+    print(f"Async Hydration: {'Enabled' if ASYNC_HYDRATION else 'Disabled'} (concurrency {HYDRATION_CONCURRENCY})")
     print(f"PR Processing Threshold: {PR_PROCESSING_THRESHOLD:.1%}")
     print("=" * 80)
     print()
@@ -327,27 +335,23 @@ def update_sheet_cell(spreadsheet_key, sheet_name, row_index, col_index, value):
 
 # --- GitHub API Helpers ---
 HEADERS = {
-    "Accept": "application/vnd.github.v3+json",
     "User-Agent": "Agentic-PR-Checker",
 }
-if GITHUB_TOKEN:
-    HEADERS["Authorization"] = f"token {GITHUB_TOKEN}"
+GONE_STATUS_CODES = (404, 410)  # Deleted or foreign items: a final answer, unlike 5xx, network or rate-limit failures
 
-def make_github_api_request(url, params=None, is_retry=False):
+def make_github_api_request(url, params=None, cache=False):
+    """
+    Makes a request to the GitHub API through the shared pooled client.
+    Returns None instead of raising so callers can skip the item.
+    Pass cache=True to go through the on-disk ETag cache.
+    """
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        return response
+        return github_get(url, params=params, headers=HEADERS, cache=cache)
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 403 and 'rate limit exceeded' in e.response.text.lower() and not is_retry:
-            reset_time_utc = int(e.response.headers.get('X-RateLimit-Reset', time.time() + 60))
-            wait_time = max(reset_time_utc - time.time(), 0) + 5  # Add a 5-second buffer
-            print(f"⏳ Rate limit exceeded. Waiting for {int(wait_time)} seconds...")
-            time.sleep(wait_time)
-            return make_github_api_request(url, params, is_retry=True) # Retry the request once
-        
-        if e.response.status_code == 404:
-            print(f"❌ 404 Not Found for URL: {url}")
+        if e.response is not None and e.response.status_code in GONE_STATUS_CODES:
+            print(f"❌ {e.response.status_code} Not Found for URL: {url}")
+            with _ISSUE_MEMO_LOCK:
+                _GONE_URLS.add(url)
         else:
             print(f"❌ HTTP Error for {url}: {e}")
         return None
@@ -366,42 +370,183 @@ def parse_github_url(url):
         print(f"❌ Invalid GitHub URL '{url}': {e}")
         return None, None
 
-def get_merged_prs(owner, repo, merged_after_date):
+def _merged_after(page_data, merged_after_date, updated_after=None):
+    """
+    Returns the PRs of one /pulls page that were merged after the cutoff date
+    (and, for incremental runs, updated at or after the watermark).
+    """
+    prs = []
+    for pr in page_data:
+        if pr.get("merged_at"):
+            merged_at_dt = datetime.fromisoformat(pr["merged_at"].replace("Z", "+00:00"))
+            if merged_at_dt > merged_after_date:
+                if updated_after and datetime.fromisoformat(pr["updated_at"].replace("Z", "+00:00")) < updated_after:
+                    continue
+                prs.append(pr)
+    return prs
+
+def _last_page_number(response):
+    """Reads the page number of rel="last" from the Link header, or None if there is only one page."""
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return None
+    page = parse_qs(urlparse(last_url).query).get("page")
+    return int(page[0]) if page else None
+
+def get_merged_prs(owner, repo, merged_after_date, updated_after=None):
+    """
+    Lists merged PRs through /pulls. Returns ``(prs, complete)``; ``complete``
+    is False if a page could not be fetched, so the listing may be missing PRs.
+    """
     print(f"📡 Fetching merged PRs for {owner}/{repo}...")
+    if PARALLEL_PAGE_FETCH:
+        return get_merged_prs_parallel(owner, repo, merged_after_date, updated_after)
     prs = []
+    complete = True
     page = 1
     while True:
         url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
         params = {"state": "closed", "sort": "updated", "direction": "desc", "per_page": 100, "page": page}
-        response = make_github_api_request(url, params)
-        if not response: break
+        response = make_github_api_request(url, params, cache=True)
+        if not response:
+            complete = False
+            break
         data = response.json()
         if not data: break
         
-        page_had_valid_prs = False
-        for pr in data:
-            if pr.get("merged_at"):
-                merged_at_dt = datetime.fromisoformat(pr["merged_at"].replace("Z", "+00:00"))
-                if merged_at_dt > merged_after_date:
-                    prs.append(pr)
-                    page_had_valid_prs = True
+        page_prs = _merged_after(data, merged_after_date, updated_after)
+        prs.extend(page_prs)
         
         # If a page has no PRs merged after our date, we can stop.
-        if not page_had_valid_prs or len(data) < 100:
+        if not page_prs or len(data) < 100:
             print("Reached last page or PRs older than the cutoff date. Stopping.")
             break
         page += 1
         time.sleep(0.5)
+    if not complete:
+        print(colored(f"⚠️ Could not fetch page {page} of merged PRs; the listing is incomplete.", "yellow"))
     print(f"✅ Found {len(prs)} merged PRs since {merged_after_date.date()}.")
-    return prs
+    return prs, complete
+
+def get_merged_prs_parallel(owner, repo, merged_after_date, updated_after=None):
+    """
+    Lists merged PRs by reading the last page number from page 1's Link header
+    and fetching the remaining pages concurrently. Pages are handed out in
+    order; once a page has no PR merged after the cutoff, no later pages are
+    requested and results from later pages are dropped, which matches the
+    sequential walk. The rate-limit scheduler paces the requests.
+    Returns ``(prs, complete)`` like :func:`get_merged_prs`; a failed page
+    also stops the walk but marks the listing incomplete.
+    """
+    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
+    params = {"state": "closed", "sort": "updated", "direction": "desc", "per_page": 100}
+
+    def fetch_page(page):
+        response = make_github_api_request(url, {**params, "page": page}, cache=True)
+        return response, (response.json() if response else None)
+
+    first_response, first_data = fetch_page(1)
+    if first_data is None:
+        print(colored("⚠️ Could not fetch the first page of merged PRs; the listing is incomplete.", "yellow"))
+        return [], False
+    if not first_data:
+        print(f"✅ Found 0 merged PRs since {merged_after_date.date()}.")
+        return [], True
+
+    pages = {1: _merged_after(first_data, merged_after_date, updated_after)}
+    failed_pages = set()
+    cutoff_page = 1 if not pages[1] else None  # First page with nothing past the cutoff (or a failed page)
+    last_page = _last_page_number(first_response) or 1
+    if cutoff_page is None and last_page > 1:
+        print(f"📄 {last_page} pages of closed PRs; fetching with {PAGE_FETCH_WORKERS} workers...")
+        next_page = 2
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+            in_flight = {}
+            while in_flight or next_page <= last_page:
+                # Keep the workers busy, but never hand out pages past a known cutoff
+                while (len(in_flight) < PAGE_FETCH_WORKERS and next_page <= last_page
+                       and (cutoff_page is None or next_page < cutoff_page)):
+                    in_flight[executor.submit(fetch_page, next_page)] = next_page
+                    next_page += 1
+                if not in_flight:
+                    break
+                done = next(as_completed(in_flight))
+                page = in_flight.pop(done)
+                _, data = done.result()
+                if data is None:
+                    failed_pages.add(page)
+                page_prs = _merged_after(data or [], merged_after_date, updated_after)
+                pages[page] = page_prs
+                if not page_prs and (cutoff_page is None or page < cutoff_page):
+                    cutoff_page = page
+
+    prs = []
+    for page in sorted(pages):
+        if cutoff_page is not None and page > cutoff_page:
+            break
+        prs.extend(pages[page])
+    complete = cutoff_page not in failed_pages
+    if not complete:
+        print(colored(f"⚠️ Could not fetch page {cutoff_page} of merged PRs; the listing is incomplete.", "yellow"))
+    print("Reached last page or PRs older than the cutoff date. Stopping.")
+    print(f"✅ Found {len(prs)} merged PRs since {merged_after_date.date()}.")
+    return prs, complete
+
+# Memo of issue payloads for the repo being analysed, keyed by URL: several PRs often link the
+# same issue. It is cleared at the start of every repo so bulk runs do not keep every issue.
+_ISSUE_MEMO = {}
+_ISSUE_MEMO_LOCK = threading.Lock()
+_GONE_URLS = set()  # URLs that answered 404/410 since the memo was last cleared
+
+def clear_issue_memo():
+    with _ISSUE_MEMO_LOCK:
+        _ISSUE_MEMO.clear()
+        _GONE_URLS.clear()
+
+def is_gone(url):
+    """True if ``url`` answered 404/410, i.e. fetching it again will not help."""
+    with _ISSUE_MEMO_LOCK:
+        return url in _GONE_URLS
+
+def get_json_once(url):
+    """
+    Returns the JSON payload of an issue GET, fetching each URL at most once per repo.
+    Failed requests are not memoized so they can be retried.
+    """
+    with _ISSUE_MEMO_LOCK:
+        if url in _ISSUE_MEMO:
+            return _ISSUE_MEMO[url]
+    response = make_github_api_request(url, cache=True)
+    if not response:
+        return None
+    payload = response.json()
+    with _ISSUE_MEMO_LOCK:
+        _ISSUE_MEMO[url] = payload
+    return payload
 
 def get_pr_files(pr_files_url):
-    response = make_github_api_request(pr_files_url)
-    return response.json() if response else []
+    """Returns the files of a PR, or None if they could not be fetched. Each PR's files are read once, so they are not memoized."""
+    response = make_github_api_request(pr_files_url, cache=True)
+    return response.json() if response else None
+
+def issue_api_url(owner, repo, issue_number):
+    return f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
+
+def pr_files_api_url(owner, repo, pr_number):
+    return f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
+
+def get_issue_json(owner, repo, issue_number):
+    return get_json_once(issue_api_url(owner, repo, issue_number))
 
 def get_issue_body(issue_url):
-    response = make_github_api_request(issue_url)
-    return response.json().get("body", "") if response else ""
+    issue = get_json_once(issue_url)
+    return issue.get("body", "") if issue else ""
+
+def get_pr_issue_body(pr, owner, repo):
+    """Returns the linked issue body kept from the logical pass, fetching it only if it is missing."""
+    if pr.get('issue_body') is not None:
+        return pr['issue_body']
+    return get_issue_body(issue_api_url(owner, repo, pr['issue_number']))
 
 # --- Analysis Logic ---
 def extract_issue_number(pr_body):
@@ -424,7 +569,7 @@ def analyze_pr_files(files):
     # ------------------------------------------------------------------
     # 1. Language gate – ensure no files from other *code* languages exist
     # ------------------------------------------------------------------
-    disallowed_ext = ALL_SOURCE_EXT - allowed_ext  # dynamic disallowed set
+    disallowed_ext = get_other_source_extensions(LANGUAGE)  # dynamic disallowed set, precomputed per language
 
     for fn in filenames:
         ext = os.path.splitext(fn)[1].lower()
@@ -481,14 +626,109 @@ def run_llm_check(issue_body):
         print(f"❌ LLM analysis failed: {e}")
         return "Bad PR", f"LLM analysis failed: {e}"
 
+def fetch_candidate_prs(owner, repo, updated_after=None):
+    """
+    Fetches merged PRs using FETCH_MODE. In GraphQL mode the PRs already carry
+    their files and linked issues; if the GraphQL fetch fails the REST path is
+    used instead. In search mode only merged PRs are listed, via the search
+    API; issues and files are then fetched like in REST mode. With
+    ``updated_after`` only PRs updated since then are listed.
+    Returns ``(prs, complete)``; the GraphQL and search listings either
+    finish or raise, so only the /pulls walk can be incomplete.
+    """
+    if FETCH_MODE == "graphql":
+        try:
+            return fetch_merged_prs(owner, repo, MERGED_AFTER_DATE, extract_issue_number, updated_after), True
+        except (GraphQLError, requests.exceptions.RequestException, KeyError, TypeError) as e:
+            print(colored(f"⚠️ GraphQL fetch failed for {owner}/{repo} ({e}); falling back to REST.", "yellow"))
+    elif FETCH_MODE == "search":
+        try:
+            return search_merged_prs(owner, repo, MERGED_AFTER_DATE, updated_after), True
+        except (requests.exceptions.RequestException, KeyError, TypeError) as e:
+            print(colored(f"⚠️ Search listing failed for {owner}/{repo} ({e}); falling back to /pulls.", "yellow"))
+    return get_merged_prs(owner, repo, MERGED_AFTER_DATE, updated_after)
+
+def issue_passes_checks(issue_json):
+    """The issue-only part of check_pr_candidate: a real issue whose statement is in English."""
+    return not issue_json.get('pull_request') and is_english(issue_json.get('body', ''))
+
+def check_pr_candidate(pr, issue_number, issue_body, issue_is_pull_request, files):
+    """
+    Runs the logical filters on one PR whose linked issue and files are already known.
+    Returns the PR data to keep, or None if the PR is skipped.
+    """
+    pr_number = pr.get('number')
+
+    # Check if the linked item is actually an issue, not a PR
+    if issue_is_pull_request:
+        if DEBUG_MODE: print(f"  - Skip: Linked item #{issue_number} is a Pull Request, not an Issue.")
+        return None
+
+    # Language filtering: Issue statement must be in English (90% ASCII)
+    if not is_english(issue_body):
+        if DEBUG_MODE: print(f"  - Skip: Issue #{issue_number} statement contains too many non-English characters.")
+        return None
+
+    if not files:
+        if DEBUG_MODE: print(f"  - Skip: No files found in PR #{pr_number}")
+        return None
+
+    # Count additions/deletions only in non-test code files
+    allowed_ext = get_source_extensions(LANGUAGE)
+    dependency_files = get_dependency_files(LANGUAGE)
+
+    non_test_code_changes = 0
+    for file_info in files:
+        filename = file_info.get('filename', '')
+        ext = os.path.splitext(filename)[1].lower()
+
+        # Skip non-code files and dependency files
+        if ext not in allowed_ext or os.path.basename(filename) in dependency_files:
+            continue
+
+        # Skip test files
+        if _is_test_file(filename, LANGUAGE):
+            continue
+
+        # Count changes in this non-test code file
+        additions = file_info.get('additions', 0)
+        deletions = file_info.get('deletions', 0)
+        non_test_code_changes += additions + deletions
+
+    # Require minimum 20 lines of changes in non-test code files
+    if non_test_code_changes < 20:
+        if DEBUG_MODE: print(f"  - Skip: PR #{pr_number} has only {non_test_code_changes} lines of changes in non-test code files (minimum 20 required).")
+        return None
+
+    # Run the original file analysis checks
+    status, reason = analyze_pr_files(files)
+    if status != "Pass":
+        if DEBUG_MODE: print(f"  - Skip: {reason}")
+        return None
+
+    if DEBUG_MODE: print(f"  - Pass: Meets all logical criteria (non-test code changes: {non_test_code_changes} lines).")
+    # Store the issue number with the PR data
+    pr_data = {k: v for k, v in pr.items() if k not in ('files', 'linked_items')}
+    pr_data['issue_number'] = issue_number
+    pr_data['issue_body'] = issue_body or ''  # Reused by the LLM pass instead of fetching the issue again
+    pr_data['non_test_code_changes'] = non_test_code_changes
+    return pr_data
+
 def find_logically_relevant_prs(owner, repo):
     """
     Performs all non-agentic checks to find PRs that are candidates for agentic review.
     """
     print(f"🔍 Finding logically relevant PRs for {owner}/{repo}...")
-    all_prs = get_merged_prs(owner, repo, MERGED_AFTER_DATE)
-    logically_relevant_prs = []
-    for pr in all_prs:
+    clear_issue_memo()
+    state = load_repo_state(owner, repo, MERGED_AFTER_DATE) if INCREMENTAL_MODE else None
+    updated_after = get_watermark(state) if state else None
+    if updated_after:
+        print(f"♻️ Incremental run: {len(state['prs'])} PRs already classified, fetching PRs updated since {updated_after}.")
+    all_prs, listing_complete = fetch_candidate_prs(owner, repo, updated_after)
+    results = {}  # Listing index -> PR data that passed the filters
+    failed_numbers = set()  # PRs whose issue or files failed transiently; they get no verdict this run
+    to_hydrate = []  # REST mode: (listing index, PR, issue number) still missing issue and files
+    for index, pr in enumerate(all_prs):
         pr_number = pr.get('number')
 
         if DEBUG_MODE: 
@@ -500,75 +740,73 @@ def find_logically_relevant_prs(owner, repo):
         if not issue_number:
             if DEBUG_MODE: print(f"  - Skip: No unique issue found.")
             continue
-        
-        # Get issue details for language filtering
-        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-        issue_data = make_github_api_request(issue_url)
-        if not issue_data:
-            if DEBUG_MODE: print(f"  - Skip: Could not fetch issue #{issue_number}")
-            continue
-        
-        issue_json = issue_data.json()
-        
-        # Check if the linked item is actually an issue, not a PR
-        if issue_json.get('pull_request'):
-            if DEBUG_MODE: print(f"  - Skip: Linked item #{issue_number} is a Pull Request, not an Issue.")
-            continue
-        
-        # Language filtering: Issue statement must be in English (90% ASCII)
-        issue_body = issue_json.get('body', '')
-        if not is_english(issue_body):
-            if DEBUG_MODE: print(f"  - Skip: Issue #{issue_number} statement contains too many non-English characters.")
-            continue
-        
-        # Get PR files to analyze code changes in non-test files
-        files_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
-        files = get_pr_files(files_url)
-        if not files:
-            if DEBUG_MODE: print(f"  - Skip: No files found in PR #{pr_number}")
-            continue
-        
-        # Count additions/deletions only in non-test code files
-        allowed_ext = get_source_extensions(LANGUAGE)
-        dependency_files = get_dependency_files(LANGUAGE)
-        
-        non_test_code_changes = 0
-        for file_info in files:
-            filename = file_info.get('filename', '')
-            ext = os.path.splitext(filename)[1].lower()
-            
-            # Skip non-code files and dependency files
-            if ext not in allowed_ext or os.path.basename(filename) in dependency_files:
-                continue
-            
-            # Skip test files
-            if _is_test_file(filename, LANGUAGE):
+
+        if 'linked_items' in pr:
+            # GraphQL mode: issue and files came with the PR
+            linked_item = pr['linked_items'].get(issue_number)
+            if not linked_item:
+                if DEBUG_MODE: print(f"  - Skip: Could not fetch issue #{issue_number}")
                 continue
-            
-            # Count changes in this non-test code file
-            additions = file_info.get('additions', 0)
-            deletions = file_info.get('deletions', 0)
-            non_test_code_changes += additions + deletions
-        
-        # Require minimum 20 lines of changes in non-test code files
-        if non_test_code_changes < 20:
-            if DEBUG_MODE: print(f"  - Skip: PR #{pr_number} has only {non_test_code_changes} lines of changes in non-test code files (minimum 20 required).")
-            continue
-            
-        # Run the original file analysis checks
-        status, reason = analyze_pr_files(files)
-        if status != "Pass":
-            if DEBUG_MODE: print(f"  - Skip: {reason}")
-            continue
-        
-        if DEBUG_MODE: print(f"  - Pass: Meets all logical criteria (non-test code changes: {non_test_code_changes} lines).")
-        # Store the issue number with the PR data
-        pr_data = pr.copy()
-        pr_data['issue_number'] = issue_number
-        pr_data['non_test_code_changes'] = non_test_code_changes
-        logically_relevant_prs.append(pr_data)
+            pr_data = check_pr_candidate(pr, issue_number, linked_item['body'], linked_item['is_pull_request'], pr['files'])
+            if pr_data:
+                results[index] = pr_data
+        else:
+            to_hydrate.append((index, pr, issue_number))
+
+    if to_hydrate:
+        def fetch_issue(issue_number):
+            return get_issue_json(owner, repo, issue_number)
+
+        def fetch_files(pr_number):
+            return get_pr_files(pr_files_api_url(owner, repo, pr_number))
+
+        def on_hydrated(position, pr, issue_number, issue_json, files):
+            # A 404/410 (deleted issue, "#N" of another repo) is a final rejection; only
+            # transient failures leave the PR unclassified so it is retried next run
+            if DEBUG_MODE: print(f"\n--- Filtering PR #{pr.get('number')} ---")
+            if not issue_json:
+                if DEBUG_MODE: print(f"  - Skip: Could not fetch issue #{issue_number}")
+                if not is_gone(issue_api_url(owner, repo, issue_number)):
+                    failed_numbers.add(pr['number'])
+                return
+            if files is None:
+                if DEBUG_MODE: print(f"  - Skip: Could not fetch the files of PR #{pr['number']}")
+                if not is_gone(pr_files_api_url(owner, repo, pr['number'])):
+                    failed_numbers.add(pr['number'])
+                return
+            pr_data = check_pr_candidate(
+                pr, issue_number, issue_json.get('body', ''), bool(issue_json.get('pull_request')), files
+            )
+            if pr_data:
+                results[to_hydrate[position][0]] = pr_data
+
+        items = [(pr, issue_number) for _, pr, issue_number in to_hydrate]
+        if ASYNC_HYDRATION:
+            print(f"⚡ Fetching issues and files for {len(items)} PRs ({HYDRATION_CONCURRENCY} at a time)...")
+            hydrate_prs(items, fetch_issue, fetch_files, on_hydrated, HYDRATION_CONCURRENCY, issue_passes_checks)
+        else:
+            for position, (pr, issue_number) in enumerate(items):
+                issue_json = fetch_issue(issue_number)
+                files = fetch_files(pr['number']) if issue_json and issue_passes_checks(issue_json) else []
+                on_hydrated(position, pr, issue_number, issue_json, files)
+
+    # Keep the listing order so CSV reports are stable regardless of completion order
+    logically_relevant_prs = [results[index] for index in sorted(results)]
 
     print(f"✅ Found {len(logically_relevant_prs)} logically relevant PRs out of {len(all_prs)} total PRs checked.")
+
+    if state is not None:
+        # Merge with earlier runs so the report and counts cover every PR since MERGED_AFTER_DATE
+        if failed_numbers or not listing_complete:
+            print(colored(f"⚠️ {len(failed_numbers)} PRs could not be hydrated"
+                          f"{'' if listing_complete else ' and the PR listing is incomplete'}; "
+                          "they will be retried and the watermark is not advanced.", "yellow"))
+        merge_classified_prs(state, all_prs, logically_relevant_prs, failed_numbers,
+                             advance_watermark=listing_complete and not failed_numbers)
+        save_repo_state(owner, repo, state)
+        logically_relevant_prs = relevant_prs_from_state(state)
+        print(f"📦 Merged state: {len(logically_relevant_prs)} logically relevant PRs out of {len(state['prs'])} total.")
+        return logically_relevant_prs, len(state['prs'])
     return logically_relevant_prs, len(all_prs)
 
 def run_parallel_agentic_checks(prs_to_check, owner, repo):
@@ -584,8 +822,7 @@ def run_parallel_agentic_checks(prs_to_check, owner, repo):
         try:
             print(f"🤖 Processing PR #{pr_number} (parallel)...")
             
-            issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{pr['issue_number']}"
-            issue_body = get_issue_body(issue_url)
+            issue_body = get_pr_issue_body(pr, owner, repo)
             
             result, comment = run_llm_check(issue_body)
             print(f"  ✅ PR #{pr_number}: {result} | {comment}")
@@ -618,6 +855,7 @@ def run_agentic_check_on_repo(logically_relevant_prs, owner, repo):
     """
     Runs the agentic (LLM) check on a list of logically relevant PRs using parallel processing.
     Stops when the target number of good PRs is found.
+    In incremental mode, decisions stored by earlier runs are reused instead of asking the LLM again.
     Returns the agent's decision for each PR.
     """
     if not logically_relevant_prs:
@@ -632,12 +870,23 @@ def run_agentic_check_on_repo(logically_relevant_prs, owner, repo):
     # Take only the first N PRs based on threshold
     prs_to_check = logically_relevant_prs[:prs_to_process]
     
-    good_prs_found = 0
     agent_decisions = {}
+    state = None
+    if INCREMENTAL_MODE:
+        state = load_repo_state(owner, repo, MERGED_AFTER_DATE)
+        stored_decisions = get_agent_decisions(state)
+        agent_decisions = {pr['number']: stored_decisions[pr['number']] for pr in prs_to_check if pr['number'] in stored_decisions}
+        if agent_decisions:
+            print(f"♻️ Reusing {len(agent_decisions)} stored agent decisions.")
+        prs_to_check = [pr for pr in prs_to_check if pr['number'] not in agent_decisions]
+
+    good_prs_found = sum(1 for decision in agent_decisions.values() if decision.get('result') == 'Good PR')
     
-    if ENABLE_PARALLEL_PROCESSING and len(prs_to_check) > 1:
+    if good_prs_found >= TARGET_GOOD_PRS:
+        print(f"🎯 Target of {TARGET_GOOD_PRS} good PRs reached.")
+    elif ENABLE_PARALLEL_PROCESSING and len(prs_to_check) > 1:
         print(f"🚀 Using parallel processing with {MAX_WORKERS} workers...")
-        agent_decisions = run_parallel_agentic_checks(prs_to_check, owner, repo)
+        agent_decisions.update(run_parallel_agentic_checks(prs_to_check, owner, repo))
         
         # Count good PRs found
         good_prs_found = sum(1 for decision in agent_decisions.values() 
@@ -652,8 +901,7 @@ def run_agentic_check_on_repo(logically_relevant_prs, owner, repo):
             pr_number = pr['number']
             print(f"\n🤖 Running agentic check on PR #{pr_number}...")
             
-            issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{pr['issue_number']}"
-            issue_body = get_issue_body(issue_url)
+            issue_body = get_pr_issue_body(pr, owner, repo)
             
             result, comment = run_llm_check(issue_body)
             print(f"  - LLM Result: {result} | Comment: {comment}")
@@ -666,6 +914,10 @@ def run_agentic_check_on_repo(logically_relevant_prs, owner, repo):
                     print(f"🎯 Target of {TARGET_GOOD_PRS} good PRs reached.")
                     break
             time.sleep(1)
+
+    if state is not None:
+        record_agent_decisions(state, agent_decisions)
+        save_repo_state(owner, repo, state)
     
     return good_prs_found >= TARGET_GOOD_PRS, agent_decisions
 
@@ -749,6 +1001,10 @@ def main():
     # Display language configuration
     print_language_configuration()
     
+    # Interactive runs get priority over bulk sheet runs sharing the same GitHub budget
+    if SINGLE_REPO_MODE or DEBUG_MODE:
+        set_default_priority(PRIORITY_INTERACTIVE)
+
     # Check for single repo mode
     if SINGLE_REPO_MODE:
         print("🎯 SINGLE REPO MODE ENABLED")
@@ -827,6 +1083,7 @@ def main():
         else:
             print("⏭️ Skipping agentic check: No logically relevant PRs found.")
             update_sheet_cell(SPREADSHEET_KEY, SHEET_NAME, sheet_row_index, column_indices['agentic_check'], "No")
+        print(f"⏱️ GitHub budget: {format_status(get_rate_limit_status())}")
     print("\n🎉 All repositories analyzed.")
 
 def get_prs_for_repo(user_repo):
@@ -1028,6 +1285,18 @@ def parse_command_line_args():
                        help=f'Maximum number of parallel workers (default: {MAX_WORKERS})')
     parser.add_argument('--threshold', type=float, default=PR_PROCESSING_THRESHOLD,
                        help=f'Threshold for PR processing (0.0-1.0, default: {PR_PROCESSING_THRESHOLD})')
+    parser.add_argument('--hydration-concurrency', type=int, default=HYDRATION_CONCURRENCY,
+                       help=f'PRs whose issue and files are fetched at once in REST mode (default: {HYDRATION_CONCURRENCY})')
+    parser.add_argument('--no-async-hydration', action='store_true',
+                       help='Fetch issues and files one PR at a time in REST mode')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only list PRs updated since the last run and merge them with the stored per-repo state')
+    parser.add_argument('--full-refresh', action='store_true',
+                       help='Ignore stored per-repo state and re-list every PR since the cutoff date')
+    parser.add_argument('--sequential-pages', action='store_true',
+                       help='REST mode: walk /pulls pages one at a time instead of in parallel')
+    parser.add_argument('--fetch-mode', choices=['rest', 'graphql', 'search'], default=FETCH_MODE,
+                       help=f'How merged PRs, issues and files are fetched (default: {FETCH_MODE})')
     parser.add_argument('--debug', action='store_true',
                        help='Enable debug mode')
     parser.add_argument('--debug-repo', type=str, default=DEBUG_REPO_URL,
@@ -1039,9 +1308,19 @@ def update_config_from_args(args):
     """
     Update global configuration based on command line arguments.
     """
-    global LLM_MODEL, TARGET_GOOD_PRS, ENABLE_PARALLEL_PROCESSING, MAX_WORKERS, PR_PROCESSING_THRESHOLD, DEBUG_MODE, DEBUG_REPO_URL
+    global LLM_MODEL, TARGET_GOOD_PRS, ENABLE_PARALLEL_PROCESSING, MAX_WORKERS, PR_PROCESSING_THRESHOLD, DEBUG_MODE, DEBUG_REPO_URL, FETCH_MODE, ASYNC_HYDRATION, HYDRATION_CONCURRENCY, PARALLEL_PAGE_FETCH, INCREMENTAL_MODE
     
     LLM_MODEL = args.model
+    FETCH_MODE = args.fetch_mode
+    HYDRATION_CONCURRENCY = max(1, args.hydration_concurrency)
+    if args.no_async_hydration:
+        ASYNC_HYDRATION = False
+    if args.sequential_pages:
+        PARALLEL_PAGE_FETCH = False
+    if args.incremental:
+        INCREMENTAL_MODE = True
+    if args.full_refresh:
+        INCREMENTAL_MODE = False
     TARGET_GOOD_PRS = args.target_good_prs
     
     if args.no_parallel:
@@ -1,26 +1,62 @@
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 # Path to the configuration file
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+LANGUAGE_CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), 'language_configs.json')
+
+# --- Configuration Snapshots ---
+# Each file is parsed once into an immutable snapshot and only re-read when its
+# mtime changes, so getters called per file or per PR never touch the JSON.
+# Getters that return dicts hand out deep copies; sets and lists come back as
+# shared frozensets and tuples.
+
+_SNAPSHOTS: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+
+def _load_snapshot(path: str, description: str, build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return the snapshot of a JSON file, rebuilding it if the file changed.
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file is invalid JSON
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{description} not found at {path}")
+    
+    cached = _SNAPSHOTS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = build(json.load(f))
+        _SNAPSHOTS[path] = (mtime, snapshot)
+        return snapshot
+
+def _config_snapshot() -> Dict[str, Any]:
+    return _load_snapshot(CONFIG_FILE_PATH, "Configuration file", lambda data: {'raw': data})
 
 def load_config() -> Dict[str, Any]:
     """
     Load configuration from config.json file.
     
     Returns:
-        Dict containing configuration settings
+        Dict containing configuration settings (a copy of the cached snapshot)
         
     Raises:
         FileNotFoundError: If config.json doesn't exist
         json.JSONDecodeError: If config.json is invalid JSON
     """
-    if not os.path.exists(CONFIG_FILE_PATH):
-        raise FileNotFoundError(f"Configuration file not found at {CONFIG_FILE_PATH}")
-    
-    with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return copy.deepcopy(_config_snapshot()['raw'])
 
 def get_lt_token() -> str:
     """
@@ -33,21 +69,48 @@ def get_lt_token() -> str:
         KeyError: If lt_token is not found in config
         FileNotFoundError: If config file doesn't exist
     """
-    config = load_config()
-    return config['lt_token']
+    return _config_snapshot()['raw']['lt_token']
 
 def get_github_token() -> Optional[str]:
     """
     Get the GitHub token from configuration.
     
+    When several tokens are configured (see ``get_github_tokens``) this is
+    the first one.
+    
     Returns:
         GitHub token string or None if not set
     """
+    tokens = get_github_tokens()
+    return tokens[0] if tokens else None
+
+def get_github_tokens() -> List[str]:
+    """
+    Get every configured GitHub token, in priority order.
+    
+    Tokens are collected from the ``github_tokens`` list and ``github_token``
+    entry in config.json, then from the ``GITHUB_TOKENS`` (comma separated)
+    and ``GITHUB_TOKEN`` environment variables. Duplicates are dropped.
+    
+    Returns:
+        List of GitHub token strings (empty if none are set)
+    """
+    candidates = []
     try:
-        config = load_config()
-        return config.get('github_token') or os.getenv('GITHUB_TOKEN')
+        config = _config_snapshot()['raw']
+        candidates.extend(config.get('github_tokens') or [])
+        candidates.append(config.get('github_token'))
     except (FileNotFoundError, KeyError):
-        return os.getenv('GITHUB_TOKEN')
+        pass
+    candidates.extend((os.getenv('GITHUB_TOKENS') or '').split(','))
+    candidates.append(os.getenv('GITHUB_TOKEN'))
+
+    tokens = []
+    for token in candidates:
+        token = (token or '').strip()
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
 
 def get_openai_api_key() -> Optional[str]:
     """
@@ -57,7 +120,7 @@ def get_openai_api_key() -> Optional[str]:
         OpenAI API key string or None if not set
     """
     try:
-        config = load_config()
+        config = _config_snapshot()['raw']
         return config.get('openai_api_key') or os.getenv('OPENAI_API_KEY')
     except (FileNotFoundError, KeyError):
         return os.getenv('OPENAI_API_KEY')
@@ -72,8 +135,7 @@ def get_spreadsheet_key() -> str:
     Raises:
         KeyError: If spreadsheet_key is not found in config
     """
-    config = load_config()
-    return config['spreadsheet_key']
+    return _config_snapshot()['raw']['spreadsheet_key']
 
 def get_project_id(language: str) -> int:
     """
@@ -88,9 +150,8 @@ def get_project_id(language: str) -> int:
     Raises:
         KeyError: If language or project_ids not found in config
     """
-    config = load_config()
     language_lower = language.lower()
-    return config['project_ids'][language_lower]
+    return _config_snapshot()['raw']['project_ids'][language_lower]
 
 def get_config() -> Dict[str, Any]:
     """
@@ -103,23 +164,54 @@ def get_config() -> Dict[str, Any]:
 
 # --- Language Configuration Functions ---
 
+def _build_language_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompute the per-language sets, patterns and thresholds used on hot paths."""
+    languages = {}
+    for name, config in data['languages'].items():
+        file_config = config['file_analysis']
+        thresholds = {int(k): v for k, v in config['evaluation']['loc_thresholds'].items()}
+        languages[name] = {
+            'source_extensions': frozenset(file_config['source_extensions']),
+            'dependency_files': frozenset(file_config['dependency_files']),
+            'test_patterns': tuple(file_config['test_patterns']),
+            'loc_thresholds': tuple(sorted(thresholds.items(), reverse=True)),
+        }
+    all_source_extensions = frozenset().union(*(lang['source_extensions'] for lang in languages.values()))
+    for lang in languages.values():
+        lang['other_source_extensions'] = all_source_extensions - lang['source_extensions']
+
+    global_settings = data['global_settings']
+    return {
+        'raw': data,
+        'languages': languages,
+        'all_source_extensions': all_source_extensions,
+        'non_code_extensions': frozenset(global_settings['non_code_extensions']),
+        'universal_test_extensions': frozenset(global_settings['universal_test_extensions']),
+        'test_directories': tuple(global_settings['test_directories']),
+    }
+
+def _language_snapshot() -> Dict[str, Any]:
+    return _load_snapshot(LANGUAGE_CONFIG_FILE_PATH, "Language configuration file", _build_language_snapshot)
+
+def _language_key(language_name: str) -> str:
+    return language_name.replace('/', '').replace('+', '')  # Handle 'C/C++' -> 'C/C++'
+
+def _language_settings(language_name: str) -> Dict[str, Any]:
+    """Precomputed settings of a language; raises KeyError if it is not configured."""
+    return _language_snapshot()['languages'][_language_key(language_name)]
+
 def load_language_configs() -> Dict[str, Any]:
     """
     Load language configurations from language_configs.json file.
     
     Returns:
-        Dict containing language configurations
+        Dict containing language configurations (a copy of the cached snapshot)
         
     Raises:
         FileNotFoundError: If language_configs.json doesn't exist
         json.JSONDecodeError: If language_configs.json is invalid JSON
     """
-    language_config_path = os.path.join(os.path.dirname(__file__), 'language_configs.json')
-    if not os.path.exists(language_config_path):
-        raise FileNotFoundError(f"Language configuration file not found at {language_config_path}")
-    
-    with open(language_config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return copy.deepcopy(_language_snapshot()['raw'])
 
 def get_language_config(language_name: str) -> Dict[str, Any]:
     """
@@ -134,9 +226,7 @@ def get_language_config(language_name: str) -> Dict[str, Any]:
     Raises:
         KeyError: If language not found in configuration
     """
-    configs = load_language_configs()
-    language_key = language_name.replace('/', '').replace('+', '')  # Handle 'C/C++' -> 'C/C++'
-    return configs['languages'][language_key]
+    return copy.deepcopy(_language_snapshot()['raw']['languages'][_language_key(language_name)])
 
 def get_all_languages() -> Dict[str, Any]:
     """
@@ -145,8 +235,7 @@ def get_all_languages() -> Dict[str, Any]:
     Returns:
         Dictionary of all language configurations
     """
-    configs = load_language_configs()
-    return configs['languages']
+    return copy.deepcopy(_language_snapshot()['raw']['languages'])
 
 def get_global_settings() -> Dict[str, Any]:
     """
@@ -155,8 +244,7 @@ def get_global_settings() -> Dict[str, Any]:
     Returns:
         Global settings dictionary
     """
-    configs = load_language_configs()
-    return configs['global_settings']
+    return copy.deepcopy(_language_snapshot()['raw']['global_settings'])
 
 def get_language_evaluation_config(language_name: str) -> Dict[str, Any]:
     """
@@ -168,8 +256,7 @@ def get_language_evaluation_config(language_name: str) -> Dict[str, Any]:
     Returns:
         Evaluation configuration dictionary
     """
-    lang_config = get_language_config(language_name)
-    return lang_config['evaluation']
+    return copy.deepcopy(_language_snapshot()['raw']['languages'][_language_key(language_name)]['evaluation'])
 
 def get_language_file_analysis_config(language_name: str) -> Dict[str, Any]:
     """
@@ -181,8 +268,7 @@ def get_language_file_analysis_config(language_name: str) -> Dict[str, Any]:
     Returns:
         File analysis configuration dictionary
     """
-    lang_config = get_language_config(language_name)
-    return lang_config['file_analysis']
+    return copy.deepcopy(_language_snapshot()['raw']['languages'][_language_key(language_name)]['file_analysis'])
 
 def get_language_sheet_name(language_name: str) -> str:
     """
@@ -194,8 +280,7 @@ def get_language_sheet_name(language_name: str) -> str:
     Returns:
         Sheet name string
     """
-    lang_config = get_language_config(language_name)
-    return lang_config['sheet_name']
+    return _language_snapshot()['raw']['languages'][_language_key(language_name)]['sheet_name']
 
 def get_language_target_language(language_name: str) -> str:
     """
@@ -207,8 +292,7 @@ def get_language_target_language(language_name: str) -> str:
     Returns:
         Target language string
     """
-    lang_config = get_language_config(language_name)
-    return lang_config['target_language']
+    return _language_snapshot()['raw']['languages'][_language_key(language_name)]['target_language']
 
 def get_language_github_language(language_name: str) -> str:
     """
@@ -220,10 +304,9 @@ def get_language_github_language(language_name: str) -> str:
     Returns:
         GitHub language string
     """
-    lang_config = get_language_config(language_name)
-    return lang_config['github_language']
+    return _language_snapshot()['raw']['languages'][_language_key(language_name)]['github_language']
 
-def get_source_extensions(language_name: str) -> set:
+def get_source_extensions(language_name: str) -> frozenset:
     """
     Get source file extensions for a specific language.
     
@@ -231,12 +314,32 @@ def get_source_extensions(language_name: str) -> set:
         language_name: Name of the language
         
     Returns:
-        Set of source file extensions
+        Frozen set of source file extensions
+    """
+    return _language_settings(language_name)['source_extensions']
+
+def get_other_source_extensions(language_name: str) -> frozenset:
+    """
+    Get the source extensions of every other configured language.
+    
+    Args:
+        language_name: Name of the language
+        
+    Returns:
+        Frozen set of extensions that are source files of other languages only
     """
-    file_config = get_language_file_analysis_config(language_name)
-    return set(file_config['source_extensions'])
+    return _language_settings(language_name)['other_source_extensions']
 
-def get_dependency_files(language_name: str) -> set:
+def get_all_source_extensions() -> frozenset:
+    """
+    Get the source extensions of all configured languages.
+    
+    Returns:
+        Frozen set of source file extensions
+    """
+    return _language_snapshot()['all_source_extensions']
+
+def get_dependency_files(language_name: str) -> frozenset:
     """
     Get dependency file names for a specific language.
     
@@ -244,12 +347,11 @@ def get_dependency_files(language_name: str) -> set:
         language_name: Name of the language
         
     Returns:
-        Set of dependency file names
+        Frozen set of dependency file names
     """
-    file_config = get_language_file_analysis_config(language_name)
-    return set(file_config['dependency_files'])
+    return _language_settings(language_name)['dependency_files']
 
-def get_test_patterns(language_name: str) -> list:
+def get_test_patterns(language_name: str) -> tuple:
     """
     Get test file patterns for a specific language.
     
@@ -257,10 +359,9 @@ def get_test_patterns(language_name: str) -> list:
         language_name: Name of the language
         
     Returns:
-        List of test file patterns
+        Tuple of test file patterns
     """
-    file_config = get_language_file_analysis_config(language_name)
-    return file_config['test_patterns']
+    return _language_settings(language_name)['test_patterns']
 
 def get_loc_thresholds(language_name: str) -> Dict[int, int]:
     """
@@ -272,36 +373,43 @@ def get_loc_thresholds(language_name: str) -> Dict[int, int]:
     Returns:
         Dictionary mapping star counts to LOC thresholds
     """
-    eval_config = get_language_evaluation_config(language_name)
-    # Convert string keys to integers
-    return {int(k): v for k, v in eval_config['loc_thresholds'].items()}
+    return dict(_language_settings(language_name)['loc_thresholds'])
+
+def get_sorted_loc_thresholds(language_name: str) -> tuple:
+    """
+    Get LOC thresholds for a specific language, highest star count first.
+    
+    Args:
+        language_name: Name of the language
+        
+    Returns:
+        Tuple of (star count, required LOC) pairs
+    """
+    return _language_settings(language_name)['loc_thresholds']
 
-def get_non_code_extensions() -> set:
+def get_non_code_extensions() -> frozenset:
     """
     Get global non-code file extensions.
     
     Returns:
-        Set of non-code file extensions
+        Frozen set of non-code file extensions
     """
-    global_settings = get_global_settings()
-    return set(global_settings['non_code_extensions'])
+    return _language_snapshot()['non_code_extensions']
 
-def get_universal_test_extensions() -> set:
+def get_universal_test_extensions() -> frozenset:
     """
     Get universal test file extensions.
     
     Returns:
-        Set of universal test file extensions
+        Frozen set of universal test file extensions
     """
-    global_settings = get_global_settings()
-    return set(global_settings['universal_test_extensions'])
+    return _language_snapshot()['universal_test_extensions']
 
-def get_test_directories() -> list:
+def get_test_directories() -> tuple:
     """
     Get test directory patterns.
     
     Returns:
-        List of test directory patterns
+        Tuple of test directory patterns
     """
-    global_settings = get_global_settings()
-    return global_settings['test_directories'] 
\ No newline at end of file
+    return _language_snapshot()['test_directories'] 
\ No newline at end of file
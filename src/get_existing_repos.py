@@ -14,64 +14,23 @@ PROJECT_ID = get_project_id('go') # Go project
 from config_utils import get_lt_token
 LT_TOKEN = get_lt_token()
 
-# --- API URLS ---
-BASE_BATCHES_URL = f"https://eval.turing.com/api/batches?sort%5B0%5D=createdAt%2CDESC&join%5B0%5D=batchStats&join%5B1%5D=importAttempts&filter%5B0%5D=projectId%7C%7C%24eq%7C%7C{PROJECT_ID}"
-BASE_CONVERSATIONS_URL = "https://eval.turing.com/api/conversations?join%5B0%5D=project%7C%7Cid%2Cname&join%5B1%5D=batch%7C%7Cid%2Cname&join%5B2%5D=seed%7C%7Cmetadata"
+from lt_client import get_project_batches, iter_conversations
 
 
 def fetch_existing_repos():
-    """Fetches all batch data from the API by handling pagination."""
-    headers = {"Authorization": f"Bearer {LT_TOKEN}"}
-    all_batches = []
-    page = 1
-    limit = 100
-
-    while True:
-        paginated_url = f"{BASE_BATCHES_URL}&limit={limit}&page={page}"
-        print(f"Fetching batches from page {page}...")
-        try:
-            response = requests.get(paginated_url, headers=headers)
-            response.raise_for_status()
-            json_data = response.json()
-            batches_on_page = json_data.get("data")
-            if not batches_on_page:
-                break
-            all_batches.extend(batches_on_page)
-            if len(batches_on_page) < limit:
-                break
-            page += 1
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred while fetching batches on page {page}: {e}")
-            return None
-    return {"data": all_batches}
+    """Fetches all batch data for the project through the shared labeling-tool snapshot."""
+    try:
+        snapshot = get_project_batches(PROJECT_ID, LT_TOKEN)
+    except requests.exceptions.RequestException as e:
+        print(f"An error occurred while fetching batches: {e}")
+        return None
+    return {"data": snapshot.batches}
 
 
 def fetch_conversations_for_batch(batch_id):
-    """Fetches all conversations for a specific batch ID."""
-    headers = {"Authorization": f"Bearer {LT_TOKEN}"}
-    all_conversations = []
-    page = 1
-    limit = 100
-
-    while True:
-        filter_param = f"&filter%5B0%5D=batchId%7C%7C%24in%7C%7C{batch_id}"
-        paginated_url = f"{BASE_CONVERSATIONS_URL}{filter_param}&limit={limit}&page={page}"
-        print(f"  Fetching conversations for batch {batch_id}, page {page}...")
-        try:
-            response = requests.get(paginated_url, headers=headers)
-            response.raise_for_status()
-            json_data = response.json()
-            conversations_on_page = json_data.get("data")
-            if not conversations_on_page:
-                break
-            all_conversations.extend(conversations_on_page)
-            if len(conversations_on_page) < limit:
-                break
-            page += 1
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred while fetching conversations for batch {batch_id}: {e}")
-            return None
-    return all_conversations
+    """Streams the conversations of a batch; raises RequestException while iterating on failure."""
+    print(f"  Fetching conversations for batch {batch_id}...")
+    return iter_conversations(batch_id, LT_TOKEN)
 
 
 def save_repo_summary_to_csv(data, header, filename="existing_repos.csv"):
@@ -150,18 +109,20 @@ def main():
             continue
         
         print(f"\nProcessing batch: {batch_name} (ID: {batch_id})")
-        conversations = fetch_conversations_for_batch(batch_id)
-        if conversations:
-            pr_ids = []
-            for conv in conversations:
+        pr_ids = []
+        try:
+            for conv in fetch_conversations_for_batch(batch_id):
                 pr_id = conv.get("seed", {}).get("metadata", {}).get("pr_id")
                 if pr_id:
                     pr_ids.append([pr_id])
-            
-            if pr_ids:
-                save_prs_to_csv(batch_name, pr_ids)
-            else:
-                print(f"  No PRs with a 'pr_id' found for batch {batch_name}.")
+        except requests.exceptions.RequestException as e:
+            print(f"An error occurred while fetching conversations for batch {batch_id}: {e}")
+            continue
+
+        if pr_ids:
+            save_prs_to_csv(batch_name, pr_ids)
+        else:
+            print(f"  No PRs with a 'pr_id' found for batch {batch_name}.")
 
     if processed_repo_data:
         save_repo_summary_to_csv(processed_repo_data, repo_header)
@@ -0,0 +1,193 @@
+"""
+On-disk conditional-request cache for GitHub REST GET responses.
+
+Responses are stored in a small SQLite database together with their ``ETag``
+and ``Last-Modified`` validators. While an entry is younger than the TTL of
+its endpoint it is served without touching the network; once it is stale the
+next request is sent with ``If-None-Match`` / ``If-Modified-Since`` and a
+``304 Not Modified`` (which GitHub does not count against the rate limit)
+simply refreshes the entry. The database is kept under a byte budget by
+evicting the least recently used entries.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+# --- Cache Configuration ---
+CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'github_http_cache.sqlite3')
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # Evict least recently used entries beyond this size
+EVICT_TO_RATIO = 0.9  # After eviction the cache is at most this fraction of MAX_CACHE_BYTES
+
+# Per-endpoint freshness (seconds). Within the TTL a cached response is
+# returned without any request; after it the response is revalidated with its
+# ETag. The first matching pattern wins.
+TTL_POLICY = [
+    (re.compile(r'^/repos/[^/]+/[^/]+$'), 6 * 3600),  # Repo metadata (stars, default branch)
+    (re.compile(r'^/repos/[^/]+/[^/]+/languages$'), 24 * 3600),  # Language byte counts
+    (re.compile(r'^/repos/[^/]+/[^/]+/pulls$'), 0),  # PR listings change constantly; always revalidate
+    (re.compile(r'^/repos/[^/]+/[^/]+/pulls/\d+/files$'), 30 * 24 * 3600),  # Files of a merged PR never change
+    (re.compile(r'^/repos/[^/]+/[^/]+/issues/\d+$'), 24 * 3600),  # Issue bodies
+]
+DEFAULT_TTL = 0
+
+# Only these response headers are kept; everything else (rate-limit counters,
+# request ids, dates) is specific to the original request.
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+def get_ttl(url):
+    """Return the freshness TTL in seconds for a GitHub API URL."""
+    path = urlparse(url).path.rstrip('/')
+    for pattern, ttl in TTL_POLICY:
+        if pattern.match(path):
+            return ttl
+    return DEFAULT_TTL
+
+
+def make_cache_key(url, params=None):
+    """Build a stable cache key from the URL and its query parameters."""
+    if not params:
+        return url
+    query = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}{query}"
+
+
+class HTTPCache:
+    """Thread-safe, size-bounded LRU store of GitHub responses and their validators."""
+
+    def __init__(self, db_path=CACHE_DB_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " headers TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def lookup(self, key):
+        """
+        Return the cached entry for ``key`` as a dict, or None.
+        The entry includes ``age`` (seconds since it was stored or last revalidated).
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            now = time.time()
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        etag, last_modified, headers, body, stored_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': json.loads(headers),
+            'body': bytes(body),
+            'age': now - stored_at,
+        }
+
+    def conditional_headers(self, entry):
+        """Return the validator headers to send for a stale entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def mark_hit(self):
+        with self._lock:
+            self.stats['hits'] += 1
+
+    def mark_revalidated(self, key):
+        """Record a 304 for ``key``: the stored body is current again."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            conn.commit()
+            self.stats['revalidated'] += 1
+
+    def store(self, key, headers, body):
+        """Store a 200 response. Responses without validators are only kept if their TTL is non-zero."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified and get_ttl(key) <= 0:
+            return
+        kept_headers = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, etag, last_modified, headers, body, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(kept_headers), sqlite3.Binary(body),
+                 len(body), now, now),
+            )
+            self.stats['stores'] += 1
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache fits the byte budget. Caller holds the lock."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO_RATIO
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= target:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide HTTP cache, opening it on first use."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = HTTPCache()
+    return _CACHE
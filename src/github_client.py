@@ -0,0 +1,260 @@
+"""
+Shared GitHub transport used by every script that talks to the GitHub API.
+
+All requests go through one pooled ``requests.Session`` per process so TLS
+connections are kept alive and reused across repos and worker threads. The
+session caps the number of connections per host, every request carries a
+timeout, and transient failures (5xx responses, secondary rate limits,
+dropped connections) are retried with jittered exponential backoff. Every
+request is paced by the shared rate-limit scheduler in ``rate_limiter``,
+which also picks which of the configured tokens the request is sent with.
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from termcolor import colored
+
+from config_utils import get_github_token
+from github_cache import get_http_cache, get_ttl, make_cache_key
+from rate_limiter import get_scheduler, resource_for_url
+
+# --- Transport Configuration ---
+GITHUB_API_URL = "https://api.github.com"
+USER_AGENT = "repo-checker"
+
+CONNECT_TIMEOUT = 10  # Seconds to establish a connection
+READ_TIMEOUT = 60  # Seconds to wait for the server between bytes
+
+POOL_CONNECTIONS = 4  # Number of distinct hosts kept in the pool
+POOL_MAXSIZE = 16  # Keep-alive connections per host (also the per-host concurrency cap)
+
+MAX_RETRIES = 4  # Retries on 5xx, secondary rate limits and connection errors
+BACKOFF_BASE = 1.0  # Seconds; doubled on every attempt
+BACKOFF_MAX = 60.0  # Upper bound for a single backoff sleep
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+ENABLE_HTTP_CACHE = True  # Set to False to bypass the on-disk ETag cache entirely
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_WARNED_UNAUTHENTICATED = False
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    pool_block=True,  # Wait for a free connection instead of opening extra ones
+                    max_retries=0,  # Retries are handled below so they can be logged and jittered
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def get_default_headers(github_token=None):
+    """
+    Build the default GitHub headers, including the auth token. Without a
+    token the requests go out unauthenticated (with a much lower rate limit).
+    """
+    github_token = github_token or get_github_token()
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": USER_AGENT,
+    }
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+    else:
+        _warn_unauthenticated()
+    return headers
+
+
+def _warn_unauthenticated():
+    """Print the missing-token warning once per process."""
+    global _WARNED_UNAUTHENTICATED
+    if not _WARNED_UNAUTHENTICATED:
+        _WARNED_UNAUTHENTICATED = True
+        print(colored("⚠️ Warning: GITHUB_TOKEN not set in config.json or environment variable. "
+                      "Sending unauthenticated requests; rate limits will be lower.", "yellow"))
+
+
+def _backoff_delay(attempt):
+    """Return how long to sleep before the given retry attempt (0-based), using full jitter."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _is_secondary_rate_limit(response):
+    """Secondary (abuse) limits come back as 403/429 with Retry-After or a telltale message."""
+    if response.status_code not in (403, 429):
+        return False
+    if response.headers.get("Retry-After"):
+        return True
+    return "secondary rate limit" in response.text.lower()
+
+
+def _is_primary_rate_limit(response):
+    """The hourly quota is exhausted: 403/429 with X-RateLimit-Remaining at zero."""
+    if response.status_code not in (403, 429):
+        return False
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    return "rate limit exceeded" in response.text.lower()
+
+
+def github_request(method, url, params=None, headers=None, json=None, stream=False, timeout=None):
+    """
+    Sends a request to the GitHub API through the shared session.
+
+    Every attempt first takes a slot from the process-wide rate-limit
+    scheduler, is sent with the token it hands out, and reports the
+    response's rate-limit headers back to it, so all threads pace themselves
+    against the same budgets. A token that runs out is swapped for the next
+    one with headroom without sleeping. Retries 5xx
+    responses, secondary rate limits and connection errors with jittered
+    exponential backoff. Raises ``requests.HTTPError`` for any response that
+    is still unsuccessful, and ``requests.RequestException`` if the network
+    keeps failing.
+    """
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    session = get_session()
+    scheduler = get_scheduler()
+    resource = resource_for_url(url)
+
+    attempt = 0
+    rate_limited = 0
+    while True:
+        token = scheduler.acquire(resource)
+        request_headers = get_default_headers(token)
+        if headers:
+            request_headers.update(headers)
+        try:
+            response = session.request(
+                method, url, params=params, headers=request_headers,
+                json=json, stream=stream, timeout=timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            scheduler.release(token, resource)
+            if attempt >= MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt)
+            print(colored(f"[GitHub] {type(e).__name__} for {url}; retrying in {delay:.1f}s "
+                          f"({attempt + 1}/{MAX_RETRIES})", "yellow"))
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            scheduler.release(token, resource)
+            raise
+        scheduler.release(token, resource, response.headers)
+
+        if response.status_code in RETRY_STATUS_CODES or _is_secondary_rate_limit(response):
+            if attempt < MAX_RETRIES:
+                # A Retry-After has already blocked the resource in the scheduler;
+                # the jittered backoff keeps this thread from retrying in lockstep.
+                delay = _backoff_delay(attempt)
+                print(colored(f"[GitHub] HTTP {response.status_code} for {url}; retrying in {delay:.1f}s "
+                              f"({attempt + 1}/{MAX_RETRIES})", "yellow"))
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+        elif _is_primary_rate_limit(response) and rate_limited < scheduler.token_count():
+            # The scheduler now knows this token is empty: the next acquire()
+            # hands out another token with headroom, or holds until a reset.
+            print(colored(f"[GitHub] Rate limit exceeded for {url}. Retrying with the next available token...", "red"))
+            response.close()
+            rate_limited += 1
+            continue
+
+        response.raise_for_status()
+        return response
+
+
+def _response_from_cache(url, entry):
+    """Rebuild a ``requests.Response`` from a cached entry."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response.url = url
+    response.encoding = 'utf-8'
+    response.from_cache = True
+    return response
+
+
+def github_get(url, params=None, headers=None, stream=False, timeout=None, cache=False):
+    """
+    GET convenience wrapper around :func:`github_request`.
+
+    With ``cache=True`` the response is served from, and stored in, the
+    on-disk ETag cache: fresh entries skip the network and stale ones are
+    revalidated with a conditional request.
+    """
+    if not cache or stream or not ENABLE_HTTP_CACHE:
+        return github_request("GET", url, params=params, headers=headers, stream=stream, timeout=timeout)
+
+    http_cache = get_http_cache()
+    key = make_cache_key(url, params)
+    entry = http_cache.lookup(key)
+    if entry is not None and entry['age'] < get_ttl(key):
+        http_cache.mark_hit()
+        return _response_from_cache(url, entry)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(http_cache.conditional_headers(entry))
+
+    response = github_request("GET", url, params=params, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and entry is not None:
+        http_cache.mark_revalidated(key)
+        return _response_from_cache(url, entry)
+    if response.status_code == 200:
+        http_cache.store(key, response.headers, response.content)
+    return response
+
+
+def get_pygithub_client(github_token=None):
+    """
+    Returns a PyGithub client configured with the same timeouts, pool size
+    and retry policy as the shared session. Without a token the client is
+    unauthenticated, like the REST path.
+    """
+    from github import Github
+
+    github_token = github_token or get_github_token()
+    if not github_token:
+        _warn_unauthenticated()
+
+    try:
+        # PyGithub >= 1.59 ships a Retry subclass that understands secondary rate limits
+        from github import GithubRetry
+        retry = GithubRetry(total=MAX_RETRIES, backoff_factor=BACKOFF_BASE)
+    except ImportError:
+        from urllib3.util.retry import Retry
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=BACKOFF_BASE,
+            status_forcelist=sorted(RETRY_STATUS_CODES),
+            respect_retry_after_header=True,
+        )
+
+    return Github(
+        github_token or None,
+        timeout=READ_TIMEOUT,
+        user_agent=USER_AGENT,
+        retry=retry,
+        pool_size=POOL_MAXSIZE,
+    )
@@ -0,0 +1,209 @@
+"""
+GraphQL bulk fetcher for merged pull requests.
+
+The REST path needs one ``/pulls`` page per 100 PRs plus an ``/issues/{n}``
+and a ``/pulls/{n}/files`` call for every PR. Here a single GraphQL query
+returns a page of merged PRs together with their body, ``closingIssuesReferences``
+(with issue bodies) and changed files (path, additions, deletions). Issues
+referenced only in a PR body are resolved afterwards in batches of aliased
+``issueOrPullRequest`` lookups, which also tell whether the number is a PR.
+
+PRs are returned in the same shape the REST path produces, with two extra
+keys, ``files`` and ``linked_items``, so the existing logical filters can run
+on the data locally.
+"""
+
+from datetime import datetime
+
+from github_client import GITHUB_API_URL, github_request
+
+# --- GraphQL Configuration ---
+GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+PR_PAGE_SIZE = 50  # PRs per query; 50-100 keeps each query well under GitHub's node limit
+FILES_PAGE_SIZE = 100  # Files fetched with each PR; larger PRs are paged separately
+CLOSING_ISSUES_PAGE_SIZE = 10
+ISSUE_BATCH_SIZE = 50  # Aliased issueOrPullRequest lookups per query
+
+MERGED_PRS_QUERY = """
+query($owner: String!, $name: String!, $pageSize: Int!, $filesPageSize: Int!, $issuesPageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: MERGED, orderBy: {field: UPDATED_AT, direction: DESC}, first: $pageSize, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        url
+        mergedAt
+        updatedAt
+        closingIssuesReferences(first: $issuesPageSize) {
+          nodes { number body }
+        }
+        files(first: $filesPageSize) {
+          pageInfo { hasNextPage endCursor }
+          nodes { path additions deletions }
+        }
+      }
+    }
+  }
+}
+"""
+
+PR_FILES_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      files(first: $pageSize, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { path additions deletions }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when GitHub answers a GraphQL query with errors and no usable data."""
+
+
+def graphql_query(query, variables=None):
+    """Run a GraphQL query through the shared GitHub client and return its ``data``."""
+    response = github_request("POST", GRAPHQL_URL, json={"query": query, "variables": variables or {}})
+    payload = response.json()
+    errors = payload.get("errors")
+    data = payload.get("data")
+    if errors and not data:
+        raise GraphQLError("; ".join(error.get("message", str(error)) for error in errors))
+    return data
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _to_rest_files(nodes):
+    return [
+        {"filename": node["path"], "additions": node.get("additions", 0), "deletions": node.get("deletions", 0)}
+        for node in nodes
+    ]
+
+
+def _fetch_remaining_files(owner, repo, number, cursor):
+    """Page through the files of a PR that has more than one page of them."""
+    files = []
+    while cursor:
+        data = graphql_query(PR_FILES_QUERY, {
+            "owner": owner, "name": repo, "number": number,
+            "pageSize": FILES_PAGE_SIZE, "cursor": cursor,
+        })
+        connection = data["repository"]["pullRequest"]["files"]
+        files.extend(_to_rest_files(connection["nodes"]))
+        cursor = connection["pageInfo"]["endCursor"] if connection["pageInfo"]["hasNextPage"] else None
+    return files
+
+
+def _to_rest_pr(owner, repo, node):
+    """Convert a GraphQL PR node to the REST shape used by the logical filters."""
+    files = _to_rest_files(node["files"]["nodes"])
+    files_page = node["files"]["pageInfo"]
+    if files_page["hasNextPage"]:
+        files.extend(_fetch_remaining_files(owner, repo, node["number"], files_page["endCursor"]))
+
+    linked_items = {
+        str(issue["number"]): {"body": issue.get("body") or "", "is_pull_request": False}
+        for issue in node["closingIssuesReferences"]["nodes"]
+    }
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "body": node.get("body"),
+        "html_url": node["url"],
+        "merged_at": node["mergedAt"],
+        "updated_at": node["updatedAt"],
+        "files": files,
+        "linked_items": linked_items,
+    }
+
+
+def resolve_linked_items(owner, repo, numbers):
+    """
+    Look up issue/PR numbers in batches of aliased queries.
+    Returns ``{number: {"body": ..., "is_pull_request": bool}}``; numbers that
+    do not exist are left out.
+    """
+    numbers = sorted({int(n) for n in numbers})
+    resolved = {}
+    for start in range(0, len(numbers), ISSUE_BATCH_SIZE):
+        batch = numbers[start:start + ISSUE_BATCH_SIZE]
+        fields = "\n".join(
+            f"i{n}: issueOrPullRequest(number: {n}) {{ __typename ... on Issue {{ body }} ... on PullRequest {{ body }} }}"
+            for n in batch
+        )
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+        repository = graphql_query(query, {"owner": owner, "name": repo})["repository"] or {}
+        for n in batch:
+            item = repository.get(f"i{n}")
+            if item:
+                resolved[str(n)] = {
+                    "body": item.get("body") or "",
+                    "is_pull_request": item["__typename"] == "PullRequest",
+                }
+    return resolved
+
+
+def fetch_merged_prs(owner, repo, merged_after_date, extract_issue_number=None, updated_after=None):
+    """
+    Fetch PRs merged after ``merged_after_date`` with their files and linked issues.
+
+    PRs are paged newest-updated first and paging stops at the first page
+    without a PR merged after the cutoff, like the REST path. With
+    ``updated_after`` (incremental runs) PRs last updated before it are
+    ignored as well, so paging stops at the watermark. If
+    ``extract_issue_number`` is given, the issue each PR body points at is
+    resolved too when it is not already among the closing references.
+    """
+    print(f"📡 Fetching merged PRs for {owner}/{repo} via GraphQL...")
+    prs = []
+    cursor = None
+    while True:
+        data = graphql_query(MERGED_PRS_QUERY, {
+            "owner": owner, "name": repo, "pageSize": PR_PAGE_SIZE,
+            "filesPageSize": FILES_PAGE_SIZE, "issuesPageSize": CLOSING_ISSUES_PAGE_SIZE,
+            "cursor": cursor,
+        })
+        repository = data.get("repository")
+        if not repository:
+            print(f"❌ Repository {owner}/{repo} not found via GraphQL.")
+            break
+        connection = repository["pullRequests"]
+
+        page_had_valid_prs = False
+        for node in connection["nodes"]:
+            if not node.get("mergedAt") or _parse_datetime(node["mergedAt"]) <= merged_after_date:
+                continue
+            if updated_after and _parse_datetime(node["updatedAt"]) < updated_after:
+                continue
+            prs.append(_to_rest_pr(owner, repo, node))
+            page_had_valid_prs = True
+
+        if not page_had_valid_prs or not connection["pageInfo"]["hasNextPage"]:
+            print("Reached last page or PRs older than the cutoff date. Stopping.")
+            break
+        cursor = connection["pageInfo"]["endCursor"]
+
+    if extract_issue_number:
+        missing = set()
+        for pr in prs:
+            issue_number = extract_issue_number(pr.get("body"))
+            if issue_number and issue_number not in pr["linked_items"]:
+                missing.add(issue_number)
+        if missing:
+            resolved = resolve_linked_items(owner, repo, missing)
+            for pr in prs:
+                issue_number = extract_issue_number(pr.get("body"))
+                if issue_number in resolved and issue_number not in pr["linked_items"]:
+                    pr["linked_items"][issue_number] = resolved[issue_number]
+
+    print(f"✅ Found {len(prs)} merged PRs since {merged_after_date.date()}.")
+    return prs
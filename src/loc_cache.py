@@ -0,0 +1,212 @@
+"""
+Persistent LOC store keyed by ``(repo, head commit SHA)``.
+
+Counting lines is by far the most expensive logical check, and the count of
+a given commit never changes. Results are therefore kept in a small SQLite
+database next to the HTTP cache and survive across runs. Re-evaluating a
+repo after a threshold change or a sheet reset then costs one cheap SHA
+lookup instead of a full count.
+
+* An exact ``(repo, sha)`` entry is used while it is younger than ``LOC_TTL_DAYS``.
+* If the head SHA cannot be resolved, the newest entry for the repo that is
+  younger than ``FALLBACK_MAX_AGE_DAYS`` is used instead.
+
+Each entry also keeps the per-language byte counts GitHub reported for the
+repo, so ``loc_estimator`` can calibrate bytes-per-line ratios against the
+exact counts (see :meth:`LOCCache.calibration_samples`).
+
+Run ``python loc_cache.py stats`` to inspect the store and
+``python loc_cache.py prune [--older-than DAYS] [--keep-latest]`` to trim it.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- LOC Cache Configuration ---
+LOC_CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'loc_cache.sqlite3')
+LOC_TTL_DAYS = 180  # Exact-SHA entries older than this are recounted
+FALLBACK_MAX_AGE_DAYS = 14  # Max age of a same-repo entry used when the head SHA is unknown
+UNKNOWN_SHA = ''  # Stored for counts whose commit could not be resolved
+SCHEMA_VERSION = 3  # Bumped when stored counts must be discarded (2: block comments opened after code, 3: strings, build dirs)
+
+DAY = 24 * 3600
+
+
+class LOCCache:
+    """Thread-safe SQLite store of LOC counts per repository commit."""
+
+    def __init__(self, db_path=LOC_CACHE_DB_PATH, ttl_days=LOC_TTL_DAYS):
+        self.db_path = db_path
+        self.ttl = ttl_days * DAY
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {'hits': 0, 'fallback_hits': 0, 'misses': 0, 'stores': 0}
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS loc ("
+                " repo TEXT NOT NULL,"
+                " sha TEXT NOT NULL,"
+                " total INTEGER NOT NULL,"
+                " languages TEXT NOT NULL,"
+                " engine TEXT,"
+                " counted_at REAL NOT NULL,"
+                " language_bytes TEXT,"
+                " PRIMARY KEY (repo, sha))"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(loc)")}
+            if 'language_bytes' not in columns:  # Stores created before byte counts were kept
+                conn.execute("ALTER TABLE loc ADD COLUMN language_bytes TEXT")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Older local counts mis-handled comments after code or in strings, and nested build dirs
+                conn.execute("DELETE FROM loc WHERE engine IN ('tarball', 'local')")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_entry(row):
+        sha, total, languages, engine, counted_at = row
+        return {
+            'sha': sha or None,
+            'total': total,
+            'languages': json.loads(languages),
+            'engine': engine,
+            'age_days': (time.time() - counted_at) / DAY,
+        }
+
+    def get(self, repo, sha):
+        """Return the entry for an exact commit if it is within the TTL, else None."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT sha, total, languages, engine, counted_at FROM loc"
+                " WHERE repo = ? AND sha = ? AND counted_at >= ?",
+                (repo.lower(), sha, time.time() - self.ttl),
+            ).fetchone()
+            self.stats['hits' if row else 'misses'] += 1
+        return self._row_to_entry(row) if row else None
+
+    def get_recent(self, repo, max_age_days=FALLBACK_MAX_AGE_DAYS):
+        """Return the newest entry for ``repo`` (any commit) younger than ``max_age_days``, else None."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT sha, total, languages, engine, counted_at FROM loc"
+                " WHERE repo = ? AND counted_at >= ? ORDER BY counted_at DESC LIMIT 1",
+                (repo.lower(), time.time() - max_age_days * DAY),
+            ).fetchone()
+            self.stats['fallback_hits' if row else 'misses'] += 1
+        return self._row_to_entry(row) if row else None
+
+    def put(self, repo, sha, total, languages=None, engine=None, language_bytes=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO loc (repo, sha, total, languages, engine, counted_at, language_bytes)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (repo.lower(), sha or UNKNOWN_SHA, total, json.dumps(languages or {}), engine, time.time(),
+                 json.dumps(language_bytes) if language_bytes else None),
+            )
+            conn.commit()
+            self.stats['stores'] += 1
+
+    def calibration_samples(self, engines=('tarball', 'local')):
+        """
+        Return ``(languages, language_bytes)`` pairs of the newest entry per
+        repo that has both per-language line counts and GitHub byte counts.
+        Only counts from ``engines`` are used, since codetabs has no per-language split.
+        """
+        placeholders = ', '.join('?' for _ in engines)
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT languages, language_bytes FROM loc l"
+                f" WHERE language_bytes IS NOT NULL AND engine IN ({placeholders})"
+                " AND counted_at = (SELECT MAX(l2.counted_at) FROM loc l2 WHERE l2.repo = l.repo"
+                f" AND l2.language_bytes IS NOT NULL AND l2.engine IN ({placeholders}))",
+                tuple(engines) * 2,
+            ).fetchall()
+        return [(json.loads(languages), json.loads(language_bytes)) for languages, language_bytes in rows]
+
+    def prune(self, older_than_days=None, keep_latest=False):
+        """
+        Delete entries older than ``older_than_days`` (default: the TTL). With
+        ``keep_latest`` only the newest entry per repo is kept. Returns the number of rows deleted.
+        """
+        cutoff = time.time() - (older_than_days if older_than_days is not None else self.ttl / DAY) * DAY
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute("DELETE FROM loc WHERE counted_at < ?", (cutoff,)).rowcount
+            if keep_latest:
+                deleted += conn.execute(
+                    "DELETE FROM loc WHERE counted_at < (SELECT MAX(l2.counted_at) FROM loc l2 WHERE l2.repo = loc.repo)"
+                ).rowcount
+            conn.commit()
+            conn.execute("VACUUM")
+        return deleted
+
+    def summary(self):
+        """Return entry and repo counts plus the age range of the store."""
+        with self._lock:
+            entries, repos, oldest, newest = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT repo), MIN(counted_at), MAX(counted_at) FROM loc"
+            ).fetchone()
+        now = time.time()
+        return {
+            'entries': entries,
+            'repos': repos,
+            'oldest_days': (now - oldest) / DAY if oldest else None,
+            'newest_days': (now - newest) / DAY if newest else None,
+        }
+
+    def format_stats(self):
+        lookups = self.stats['hits'] + self.stats['fallback_hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] + self.stats['fallback_hits']) / lookups if lookups else 0
+        return (f"{self.stats['hits']} hits, {self.stats['fallback_hits']} fallback hits, "
+                f"{self.stats['misses']} misses ({hit_rate:.0%} hit rate), {self.stats['stores']} stored")
+
+
+_LOC_CACHE = None
+_LOC_CACHE_LOCK = threading.Lock()
+
+
+def get_loc_cache():
+    """Return the process-wide LOC cache, opening it on first use."""
+    global _LOC_CACHE
+    if _LOC_CACHE is None:
+        with _LOC_CACHE_LOCK:
+            if _LOC_CACHE is None:
+                _LOC_CACHE = LOCCache()
+    return _LOC_CACHE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or prune the persistent LOC cache')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='Show how many repos and commits are stored')
+    prune_parser = subparsers.add_parser('prune', help='Delete old entries')
+    prune_parser.add_argument('--older-than', type=float, default=None,
+                              help=f'Delete entries older than this many days (default: {LOC_TTL_DAYS})')
+    prune_parser.add_argument('--keep-latest', action='store_true',
+                              help='Also drop every entry but the newest one per repo')
+    args = parser.parse_args()
+
+    cache = get_loc_cache()
+    if args.command == 'prune':
+        deleted = cache.prune(args.older_than, args.keep_latest)
+        print(f"Deleted {deleted} entries.")
+    summary = cache.summary()
+    print(f"{summary['entries']} entries for {summary['repos']} repos in {cache.db_path}")
+    if summary['entries']:
+        print(f"Newest: {summary['newest_days']:.1f} days old, oldest: {summary['oldest_days']:.1f} days old")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,401 @@
+"""
+Local lines-of-code engine used by ``logical_repo_checks.get_lines_count``.
+
+The repository is shallow-cloned (``--depth 1 --single-branch``) into a
+temporary directory and every source file is counted in a process pool.
+Blank lines and comments are not counted, like the ``linesOfCode`` figure the
+codetabs API reports, so the totals can be compared with
+``get_loc_thresholds``.
+
+* Languages are recognised by extension, using the ``source_extensions`` in
+  ``language_configs.json`` plus a few common languages the configs do not
+  list. When two configs share an extension, the language with the shorter
+  list (e.g. TypeScript rather than JavaScript for ``.ts``) wins.
+* Vendored and generated paths are skipped anywhere in the tree; generic
+  build-output names (``build``, ``out``, ``gen``...) only at the repo root,
+  since nested directories of that name are usually real source packages.
+
+The ``tarball`` backend (:func:`count_repo_lines_from_tarball`) counts the
+same way without touching disk: GitHub's gzip tarball of the branch is
+streamed through :func:`count_lines_in_tar_stream`, one member at a time.
+Memory stays bounded by ``MAX_FILE_BYTES``.
+
+Run ``python loc_counter.py <user/repo | local path | git URL | archive.tar.gz> [branch]``
+to count a repository by hand; a local directory that is not a git repo is
+counted in place, and a ``.tar``/``.tar.gz`` file is streamed.
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config_utils import get_all_languages
+
+# --- Engine Configuration ---
+CLONE_TIMEOUT = 600  # Seconds allowed for the shallow clone
+COUNT_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_FILES = 200  # Smaller trees are counted in-process; a pool would only add overhead
+FILES_PER_TASK = 64
+MAX_FILE_BYTES = 2 * 1024 * 1024  # Larger "source" files are almost always generated or bundled
+
+# Directory names that hold vendored dependencies or tooling state, skipped at any depth
+VENDORED_DIRS = {
+    '.git', '.hg', '.svn', 'node_modules', 'bower_components', 'jspm_packages', 'vendor', 'vendors',
+    'third_party', 'third-party', 'thirdparty', '3rdparty', 'Pods', 'Carthage', '.gradle', '.idea',
+    '.vscode', '__pycache__', '.venv', 'venv', '.tox', '.mypy_cache', 'site-packages', '.next', '.nuxt',
+}
+
+# Generic build-output names, skipped only at the repo root (src/gen/ or pkg/build/ are real code)
+ROOT_BUILD_DIRS = {
+    'dist', 'build', 'out', 'target', 'bin', 'obj', 'external', 'externals', 'deps', 'generated', 'gen',
+    'coverage',
+}
+
+# File name suffixes of generated or minified sources
+GENERATED_SUFFIXES = (
+    '.min.js', '.min.mjs', '.bundle.js', '.pb.go', '.pb.cc', '.pb.h', '_pb2.py', '_pb2_grpc.py',
+    '.generated.ts', '.generated.cs', '.g.dart', '.designer.cs', '_generated.go', '.d.ts',
+)
+
+# Languages the configs do not list but that still count towards a repo's size
+EXTRA_LANGUAGE_EXTENSIONS = {
+    'Kotlin': ['.kt', '.kts'],
+    'Scala': ['.scala'],
+    'Groovy': ['.groovy'],
+    'C#': ['.cs'],
+    'Swift': ['.swift'],
+    'Objective-C': ['.m', '.mm'],
+    'Ruby': ['.rb'],
+    'PHP': ['.php'],
+    'Shell': ['.sh', '.bash'],
+    'Vue': ['.vue'],
+    'JavaScript': ['.mjs', '.cjs'],
+}
+
+# Comment syntax per language: (line comment prefixes, block comment delimiter pairs)
+C_STYLE = (('//',), (('/*', '*/'),))
+HASH_STYLE = (('#',), ())
+COMMENT_STYLES = {
+    'Python': (('#',), (('"""', '"""'), ("'''", "'''"))),
+    'Ruby': HASH_STYLE,
+    'Shell': HASH_STYLE,
+    'PHP': (('//', '#'), (('/*', '*/'),)),
+    'Vue': (('//',), (('/*', '*/'), ('<!--', '-->'))),
+}
+DEFAULT_COMMENT_STYLE = C_STYLE
+
+# String delimiters per language; comment openers inside a string literal are not comments
+STRING_QUOTES = {
+    'JavaScript': ('"', "'", '`'),
+    'TypeScript': ('"', "'", '`'),
+    'Vue': ('"', "'", '`'),
+    'Rust': ('"',),  # A single quote also starts lifetimes ('a)
+}
+DEFAULT_STRING_QUOTES = ('"', "'")
+
+
+def build_extension_map():
+    """Map each source extension to a language name; the most specific config wins."""
+    ext_map = {}
+    list_sizes = {}
+    for language, config in get_all_languages().items():
+        extensions = config['file_analysis']['source_extensions']
+        for ext in extensions:
+            ext = ext.lower()
+            if ext not in ext_map or len(extensions) < list_sizes[ext]:
+                ext_map[ext] = language
+                list_sizes[ext] = len(extensions)
+    for language, extensions in EXTRA_LANGUAGE_EXTENSIONS.items():
+        for ext in extensions:
+            ext_map.setdefault(ext, language)
+    return ext_map
+
+
+def is_generated_path(filename):
+    lower = filename.lower()
+    return lower.endswith(GENERATED_SUFFIXES)
+
+
+def classify_file(filename, ext_map):
+    """Return the language of a file name, or None if it is not a countable source file."""
+    if is_generated_path(filename):
+        return None
+    return ext_map.get(os.path.splitext(filename)[1].lower())
+
+
+def is_skipped_dir(name, at_root):
+    """True for vendored directories, and for build-output names directly under the repo root."""
+    return name in VENDORED_DIRS or (at_root and name in ROOT_BUILD_DIRS)
+
+
+def iter_source_files(root, ext_map):
+    """Yield ``(path, language)`` for every countable file under ``root``."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        at_root = dirpath == root
+        dirnames[:] = [d for d in dirnames if not is_skipped_dir(d, at_root)]
+        for filename in filenames:
+            language = classify_file(filename, ext_map)
+            if not language:
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                if os.path.getsize(path) > MAX_FILE_BYTES:
+                    continue
+            except OSError:
+                continue
+            yield path, language
+
+
+def _string_end(line, start):
+    """Index of the quote closing the string literal opened at ``start``, or -1 if it runs past the line."""
+    quote = line[start]
+    index = start + 1
+    while index < len(line):
+        if line[index] == '\\':
+            index += 2
+            continue
+        if line[index] == quote:
+            return index
+        index += 1
+    return -1
+
+
+def count_code_lines(text, language):
+    """
+    Count lines that hold code, skipping blank lines and comments.
+
+    Comment openers are recognised anywhere in a line (``int a; /* x``) except
+    inside string literals (``"src/**/*.js"``), and an unclosed block comment
+    carries over to the following lines. Delimiters that open and close alike
+    (Python's triple quotes) only start a comment at the beginning of a line;
+    elsewhere they are string literals.
+    """
+    line_prefixes, block_pairs = COMMENT_STYLES.get(language, DEFAULT_COMMENT_STYLE)
+    quotes = STRING_QUOTES.get(language, DEFAULT_STRING_QUOTES)
+    code_lines = 0
+    block_end = None
+    for line in text.splitlines():
+        has_code = False
+        pos = 0
+        while pos < len(line):
+            if block_end is not None:
+                end = line.find(block_end, pos)
+                if end == -1:
+                    break
+                pos = end + len(block_end)
+                block_end = None
+                continue
+            # Earliest comment opener from here on: (index, line prefix or None, block end)
+            opener = None
+            for prefix in line_prefixes:
+                index = line.find(prefix, pos)
+                if index != -1 and (opener is None or index < opener[0]):
+                    opener = (index, prefix, None)
+            for start, end in block_pairs:
+                index = line.find(start, pos)
+                if start == end and index != -1 and line[pos:index].strip():
+                    index = -1
+                if index != -1 and (opener is None or index < opener[0]):
+                    opener = (index, start, end)
+            if opener is None:
+                has_code = has_code or bool(line[pos:].strip())
+                break
+            string_start = min((index for index in (line.find(quote, pos, opener[0]) for quote in quotes)
+                                if index != -1), default=-1)
+            if string_start != -1:
+                # A string literal opens before the comment: skip it (an unclosed one makes the rest code)
+                has_code = True
+                close = _string_end(line, string_start)
+                if close == -1:
+                    break
+                pos = close + 1
+                continue
+            index, start, end = opener
+            has_code = has_code or bool(line[pos:index].strip())
+            if end is None:
+                break  # Line comment: the rest of the line is a comment
+            close = line.find(end, index + len(start))
+            if close == -1:
+                block_end = end
+                break
+            pos = close + len(end)
+        if has_code:
+            code_lines += 1
+    return code_lines
+
+
+def _count_files(files):
+    """Worker: count a batch of ``(path, language)`` pairs. Returns ``{language: lines}``."""
+    totals = {}
+    for path, language in files:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = count_code_lines(f.read(), language)
+        except OSError:
+            continue
+        totals[language] = totals.get(language, 0) + lines
+    return totals
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """Return the shared process pool, started on first use and reused for every repo."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # Workers only read files, so the platform default start method is fine; spawn would
+            # re-run the calling script's module-level setup in every worker.
+            _POOL = ProcessPoolExecutor(max_workers=COUNT_WORKERS)
+            atexit.register(_POOL.shutdown, cancel_futures=True)
+        return _POOL
+
+
+def count_lines_in_directory(root):
+    """
+    Count code lines under ``root``.
+    Returns ``{'total': int, 'languages': {language: lines}, 'files': int}``.
+    """
+    files = list(iter_source_files(root, build_extension_map()))
+    if len(files) < PARALLEL_MIN_FILES or COUNT_WORKERS <= 1:
+        partials = [_count_files(files)]
+    else:
+        batches = [files[i:i + FILES_PER_TASK] for i in range(0, len(files), FILES_PER_TASK)]
+        partials = _get_pool().map(_count_files, batches)
+
+    languages = {}
+    for partial in partials:
+        for language, lines in partial.items():
+            languages[language] = languages.get(language, 0) + lines
+    return {'total': sum(languages.values()), 'languages': languages, 'files': len(files)}
+
+
+def _clone_url(source):
+    if os.path.isdir(source):
+        return f"file://{os.path.abspath(source)}"  # file:// so --depth is honoured for local repos
+    if '://' in source or source.startswith('git@'):
+        return source
+    return f"https://github.com/{source}.git"
+
+
+def shallow_clone(source, dest, branch=None):
+    """Clone a single branch at depth 1. Raises ``subprocess.CalledProcessError`` / ``TimeoutExpired`` on failure."""
+    command = ['git', 'clone', '--depth', '1', '--single-branch', '--no-tags', '--quiet']
+    if branch:
+        command += ['--branch', branch]
+    command += [_clone_url(source), dest]
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')  # Fail instead of prompting for credentials
+    subprocess.run(command, check=True, timeout=CLONE_TIMEOUT, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def count_repo_lines(source, branch=None):
+    """
+    Shallow-clone ``source`` (``user/repo``, a git URL or a local git repo) and count its code lines.
+    Returns the :func:`count_lines_in_directory` result, or None if the clone failed.
+    """
+    workdir = tempfile.mkdtemp(prefix='loc_')
+    try:
+        start = time.time()
+        try:
+            shallow_clone(source, os.path.join(workdir, 'repo'), branch)
+        except subprocess.CalledProcessError as e:
+            print(f"[LOC Engine] Clone failed for {source}: {e.stderr.decode(errors='ignore').strip()}")
+            return None
+        except subprocess.TimeoutExpired:
+            print(f"[LOC Engine] Clone timed out for {source} after {CLONE_TIMEOUT}s")
+            return None
+        clone_time = time.time() - start
+        result = count_lines_in_directory(os.path.join(workdir, 'repo'))
+        print(f"[LOC Engine] {source}: {result['total']:,} lines in {result['files']:,} files "
+              f"(clone {clone_time:.1f}s, count {time.time() - start - clone_time:.1f}s)")
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def count_lines_in_tar_stream(fileobj):
+    """
+    Count code lines in a tar archive read sequentially from ``fileobj``
+    (plain, gzip, bz2 or xz). Nothing is written to disk and each member is
+    read and discarded before the next one. Vendored and generated paths are
+    skipped like in :func:`count_lines_in_directory`, and the result has
+    the same shape. Members are expected under one top-level directory, as in
+    GitHub's tarballs, so the repo root is the second path component.
+    """
+    ext_map = build_extension_map()
+    languages = {}
+    files = 0
+    with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+        for member in archive:
+            archive.members = []  # Stream mode keeps every TarInfo otherwise; memory would grow with the file count
+            if not member.isfile() or member.size > MAX_FILE_BYTES:
+                continue
+            parts = member.name.split('/')
+            if any(is_skipped_dir(part, depth == 1) for depth, part in enumerate(parts[:-1])):
+                continue
+            language = classify_file(parts[-1], ext_map)
+            if not language:
+                continue
+            data = archive.extractfile(member).read()
+            lines = count_code_lines(data.decode('utf-8', errors='ignore'), language)
+            languages[language] = languages.get(language, 0) + lines
+            files += 1
+    return {'total': sum(languages.values()), 'languages': languages, 'files': files}
+
+
+def count_repo_lines_from_tarball(user_repo, ref=None):
+    """
+    Stream GitHub's tarball of ``user_repo`` (default branch unless ``ref`` is given)
+    and count its code lines. Returns the :func:`count_lines_in_tar_stream`
+    result, or None if the archive could not be downloaded or read.
+    """
+    import requests
+    from github_client import github_get
+
+    url = f"https://api.github.com/repos/{user_repo}/tarball" + (f"/{ref}" if ref else "")
+    start = time.time()
+    try:
+        response = github_get(url, stream=True)
+        try:
+            response.raw.decode_content = True  # Undo any transfer encoding; the tar's own gzip is handled by tarfile
+            result = count_lines_in_tar_stream(response.raw)
+        finally:
+            response.close()
+    except requests.exceptions.RequestException as e:
+        print(f"[LOC Engine] Tarball download failed for {user_repo}: {e}")
+        return None
+    except (tarfile.TarError, EOFError, OSError) as e:
+        print(f"[LOC Engine] Could not read tarball for {user_repo}: {e}")
+        return None
+    print(f"[LOC Engine] {user_repo}: {result['total']:,} lines in {result['files']:,} files "
+          f"(streamed tarball in {time.time() - start:.1f}s)")
+    return result
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python loc_counter.py <user/repo | local path | git URL | archive.tar.gz> [branch]")
+        sys.exit(1)
+    target = sys.argv[1]
+    if os.path.isfile(target):
+        with open(target, 'rb') as archive_file:
+            summary = count_lines_in_tar_stream(archive_file)
+    elif os.path.isdir(target) and not os.path.isdir(os.path.join(target, '.git')):
+        summary = count_lines_in_directory(target)
+    else:
+        summary = count_repo_lines(target, sys.argv[2] if len(sys.argv) > 2 else None)
+    if summary is None:
+        sys.exit(1)
+    for lang, count in sorted(summary['languages'].items(), key=lambda item: -item[1]):
+        print(f"{lang:<12} {count:>12,}")
+    print(f"{'Total':<12} {summary['total']:>12,}")
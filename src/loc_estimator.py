@@ -0,0 +1,148 @@
+"""
+Byte-based LOC estimates used as a pre-filter before exact counting.
+
+``evaluate_repo`` already has GitHub's ``/languages`` byte counts for every
+repo. Dividing each language's bytes by a typical bytes-per-line ratio gives
+a LOC estimate, and the spread of that ratio gives a confidence interval.
+When the whole interval is on one side of the threshold from
+``get_required_loc_for_stars``, the exact count cannot change the verdict and
+is skipped. Only borderline repos pay for it.
+
+Ratios start from the defaults below and are calibrated per language against
+the exact counts in the LOC cache (``loc_cache.calibration_samples``): the
+log of bytes-per-line is assumed normal, and its mean and standard deviation
+are taken from the stored repos once enough of them exist for a language.
+Languages the exact counter does not count (HTML, CSS, ...) add nothing.
+"""
+
+import math
+import statistics
+import threading
+
+from loc_cache import get_loc_cache
+from loc_counter import build_extension_map
+
+# --- Estimator Configuration ---
+DEFAULT_BYTES_PER_LINE = 40.0  # Code lines exclude blanks and comments; GitHub's bytes include them
+BYTES_PER_LINE = {
+    'Java': 45.0,
+    'JavaScript': 38.0,
+    'TypeScript': 40.0,
+    'Python': 40.0,
+    'Go': 36.0,
+    'C/C++': 38.0,
+    'Rust': 40.0,
+}
+DEFAULT_LOG_SPREAD = 0.45  # Std-dev of log(bytes per line) until a language is calibrated
+MIN_LOG_SPREAD = 0.15  # Calibrated spreads are never trusted to be tighter than this
+MIN_CALIBRATION_SAMPLES = 8  # Stored repos needed before a language's defaults are replaced
+MIN_SAMPLE_LINES = 500  # Languages with fewer counted lines in a repo are too noisy to calibrate on
+CONFIDENCE_Z = 1.96  # ~95% interval
+
+# GitHub linguist names that the exact counter reports under another name
+LINGUIST_ALIASES = {'C': 'C/C++', 'C++': 'C/C++'}
+
+
+class LOCEstimator:
+    """Estimates LOC from per-language byte counts, calibrated from the LOC cache."""
+
+    def __init__(self, cache=None):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._params = None
+        self._countable = set(build_extension_map().values())
+        self.stats = {'above': 0, 'below': 0, 'borderline': 0}
+
+    def calibrate(self):
+        """(Re)compute ``{language: (log ratio mean, log ratio std-dev, samples)}``."""
+        cache = self._cache or get_loc_cache()
+        log_ratios = {}
+        for languages, language_bytes in cache.calibration_samples():
+            bytes_per_language = {}
+            for language, size in language_bytes.items():
+                language = LINGUIST_ALIASES.get(language, language)
+                bytes_per_language[language] = bytes_per_language.get(language, 0) + size
+            for language, lines in languages.items():
+                size = bytes_per_language.get(language, 0)
+                if lines >= MIN_SAMPLE_LINES and size > 0:
+                    log_ratios.setdefault(language, []).append(math.log(size / lines))
+
+        params = {}
+        for language, values in log_ratios.items():
+            if len(values) >= MIN_CALIBRATION_SAMPLES:
+                # Prediction spread for one new repo: sample spread widened for the sample size
+                spread = max(statistics.stdev(values), MIN_LOG_SPREAD) * math.sqrt(1 + 1 / len(values))
+                params[language] = (statistics.mean(values), spread, len(values))
+        with self._lock:
+            self._params = params
+        return params
+
+    def _language_params(self, language):
+        with self._lock:
+            params = self._params
+        if params is None:
+            params = self.calibrate()
+        if language in params:
+            return params[language]
+        return math.log(BYTES_PER_LINE.get(language, DEFAULT_BYTES_PER_LINE)), DEFAULT_LOG_SPREAD, 0
+
+    def estimate(self, language_bytes):
+        """
+        Return ``{'estimate', 'low', 'high', 'calibrated'}`` for a ``/languages``
+        payload, or None if it has no language the exact counter counts.
+        """
+        estimate = low = high = 0.0
+        calibrated = True
+        countable = False
+        for language, size in language_bytes.items():
+            language = LINGUIST_ALIASES.get(language, language)
+            if language not in self._countable or size <= 0:
+                continue
+            countable = True
+            mean, spread, samples = self._language_params(language)
+            calibrated = calibrated and samples > 0
+            estimate += size / math.exp(mean)
+            # Errors are assumed to move together across languages, which keeps the interval conservative
+            low += size / math.exp(mean + CONFIDENCE_Z * spread)
+            high += size / math.exp(mean - CONFIDENCE_Z * spread)
+        if not countable:
+            return None
+        return {'estimate': round(estimate), 'low': round(low), 'high': round(high), 'calibrated': calibrated}
+
+    def classify(self, language_bytes, required_loc):
+        """
+        Return ``(verdict, estimate)`` where ``verdict`` is 'above' or 'below'
+        when the whole interval is on one side of ``required_loc``, else None.
+        """
+        estimate = self.estimate(language_bytes)
+        if estimate is None:
+            verdict = None
+        elif estimate['low'] >= required_loc:
+            verdict = 'above'
+        elif estimate['high'] < required_loc:
+            verdict = 'below'
+        else:
+            verdict = None
+        with self._lock:
+            self.stats[verdict or 'borderline'] += 1
+        return verdict, estimate
+
+    def format_stats(self):
+        decided = self.stats['above'] + self.stats['below']
+        total = decided + self.stats['borderline']
+        return (f"{self.stats['above']} clearly above, {self.stats['below']} clearly below, "
+                f"{self.stats['borderline']} borderline ({decided}/{total} exact counts skipped)")
+
+
+_ESTIMATOR = None
+_ESTIMATOR_LOCK = threading.Lock()
+
+
+def get_loc_estimator():
+    """Return the process-wide estimator; it is calibrated on first use."""
+    global _ESTIMATOR
+    if _ESTIMATOR is None:
+        with _ESTIMATOR_LOCK:
+            if _ESTIMATOR is None:
+                _ESTIMATOR = LOCEstimator()
+    return _ESTIMATOR
@@ -12,9 +12,19 @@ import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 import time
+import threading
 from datetime import datetime
 import concurrent.futures
 
+from github_client import github_get
+from loc_cache import get_loc_cache
+from loc_counter import count_repo_lines, count_repo_lines_from_tarball
+from loc_estimator import get_loc_estimator
+from lt_client import get_project_batches
+from rate_limiter import format_status, get_rate_limit_status
+from sheet_index import SheetIndex, mark_duplicates, normalize_url, unprocessed_row_indices
+from thread_output import ThreadOutput
+
 # --- Script Configuration ---
 CREDS_JSON_PATH = os.path.join(os.path.dirname(__file__), 'creds.json')
 SCOPE = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
@@ -38,6 +48,20 @@ SHEET_NAME = get_language_sheet_name(TARGET_LANGUAGE)
 # Add project_id to the language config for backward compatibility
 LANG_CONFIG['project_id'] = get_project_id(TARGET_LANGUAGE.lower())
 
+# --- LOC Configuration ---
+LOC_ENGINE = 'tarball'  # 'tarball' (stream GitHub's archive, no disk), 'local' (shallow clone) or 'codetabs' (API only)
+CODETABS_TIMEOUT = 600  # Seconds all codetabs variants of one repo may take together
+LOC_ESTIMATOR = True  # Skip the exact count when the byte-based estimate is clearly above or below the threshold
+
+# --- Concurrency Configuration ---
+EVAL_WORKERS = 16  # Repos evaluated at once; evaluation is almost entirely network wait
+LOC_CONCURRENCY = 4  # Exact LOC counts running at once (each streams a tarball or clones a repo)
+LOC_SLOTS = threading.BoundedSemaphore(LOC_CONCURRENCY)
+
+# --- Sheet Output Configuration ---
+SHEET_FLUSH_EVERY = 25  # Results buffered before they are written with one batch_update
+SHEET_FLUSH_SECONDS = 30  # Buffered results are written at least this often
+
 # --- Labeling Tool Configuration ---
 from config_utils import get_lt_token, get_project_id
 LT_TOKEN = get_lt_token()
@@ -76,6 +100,11 @@ COLUMN_CONFIG = {
         'default_index': 6,  # Column G
         'description': 'Lines of code count'
     },
+    'loc_source': {
+        'headers': ['loc source'],
+        'default_index': None,  # Optional: only written if the sheet has this header
+        'description': 'Whether LOC is an exact count or a byte-based estimate'
+    },
     'already_exists': {
         'headers': ['already exists'],
         'default_index': 7,  # Column H
@@ -115,36 +144,18 @@ COLUMN_CONFIG = {
 
 # --- GitHub API Request Handling ---
 
-def make_github_api_request(url):
+def make_github_api_request(url, cache=False):
     """
-    Makes a request to the GitHub API using the GITHUB_TOKEN environment variable.
+    Makes a request to the GitHub API through the shared pooled client.
+    Transient errors and rate limits are retried inside the client.
+    Pass cache=True to go through the on-disk ETag cache.
     """
-    github_token = os.getenv('GITHUB_TOKEN')
-    if not github_token:
-        raise ValueError("GITHUB_TOKEN environment variable not set.")
-    
-    headers = {"Accept": "application/vnd.github.v3+json", "Authorization": f"token {github_token}"}
-    
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response
+        return github_get(url, cache=cache)
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 403 and 'rate limit exceeded' in e.response.text.lower():
-            print(colored(f"Rate limit exceeded for GitHub API. Please wait and try again.", "red"))
-            # Get reset time from headers if available
-            reset_time_utc = int(e.response.headers.get('X-RateLimit-Reset', time.time() + 3600))
-            wait_time = max(reset_time_utc - time.time(), 0) + 5  # Add a 5-second buffer
-            print(colored(f"Waiting for {int(wait_time)} seconds until reset...", "red"))
-            time.sleep(wait_time)
-            # Retry once after waiting
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response
-        else:
-            # It's a different HTTP error (e.g., 404 Not Found), so we should stop and report it.
-            print(colored(f"An unexpected HTTP error occurred: {e}", "red"))
-            raise e
+        # It's a non-retryable HTTP error (e.g., 404 Not Found), so we should stop and report it.
+        print(colored(f"An unexpected HTTP error occurred: {e}", "red"))
+        raise e
 
 # --- Labeling Tool API Functions ---
 
@@ -152,6 +163,8 @@ def fetch_existing_repos_from_lt():
     """
     Fetches all batch data from the labeling tool API for the current project.
     Returns a list of repository names that already exist in the labeling tool.
+    Batches come from the shared lt_client snapshot, which may be reused from
+    disk for up to SNAPSHOT_TTL_SECONDS; that is fine for the existence check.
     """
     project_id = LANG_CONFIG['project_id']
     
@@ -160,39 +173,16 @@ def fetch_existing_repos_from_lt():
         print(colored(f"\n[Labeling Tool] Project ID {project_id} is a placeholder. Skipping labeling tool checks for {TARGET_LANGUAGE}.", "yellow"))
         return set()
     
-    base_url = f"https://eval.turing.com/api/batches?sort%5B0%5D=createdAt%2CDESC&join%5B0%5D=batchStats&join%5B1%5D=importAttempts&filter%5B0%5D=projectId%7C%7C%24eq%7C%7C{project_id}"
-    headers = {"Authorization": f"Bearer {LT_TOKEN}"}
-    all_batches = []
-    page = 1
-    limit = 100
-
     print(f"\n[Labeling Tool] Fetching existing repos for {TARGET_LANGUAGE} project (ID: {project_id})...")
 
-    while True:
-        paginated_url = f"{base_url}&limit={limit}&page={page}"
-        try:
-            response = requests.get(paginated_url, headers=headers)
-            response.raise_for_status()
-            json_data = response.json()
-            batches_on_page = json_data.get("data")
-            if not batches_on_page:
-                break
-            all_batches.extend(batches_on_page)
-            if len(batches_on_page) < limit:
-                break
-            page += 1
-        except requests.exceptions.RequestException as e:
-            print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
-            return set()
-
-    # Extract repository names and convert from USER__REPO to USER/REPO format
-    existing_repos = set()
-    for batch in all_batches:
-        batch_name = batch.get("name", "")
-        if batch_name and "__" in batch_name:
-            # Convert USER__REPO to USER/REPO
-            repo_name = batch_name.replace("__", "/")
-            existing_repos.add(repo_name.lower())  # Store in lowercase for case-insensitive comparison
+    try:
+        snapshot = get_project_batches(project_id, LT_TOKEN)
+    except requests.exceptions.RequestException as e:
+        print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
+        return set()
+
+    # Repository names in USER/REPO format, lowercased for case-insensitive comparison
+    existing_repos = set(snapshot.repo_names)
 
     print(f"[Labeling Tool] Found {len(existing_repos)} existing repositories in labeling tool")
     return existing_repos
@@ -201,6 +191,8 @@ def fetch_all_batches_from_lt():
     """
     Fetches all batch data from the labeling tool API for the current project.
     Returns a dictionary mapping USER__REPO to batch data.
+    The batch stats are copied into the sheet, so the snapshot is always
+    refreshed from the API rather than reused from disk.
     """
     project_id = LANG_CONFIG['project_id']
     
@@ -209,38 +201,16 @@ def fetch_all_batches_from_lt():
         print(colored(f"\n[Labeling Tool] Project ID {project_id} is a placeholder. Skipping labeling tool data fetch for {TARGET_LANGUAGE}.", "yellow"))
         return {}
     
-    base_url = f"https://eval.turing.com/api/batches?sort%5B0%5D=createdAt%2CDESC&join%5B0%5D=batchStats&join%5B1%5D=importAttempts&filter%5B0%5D=projectId%7C%7C%24eq%7C%7C{project_id}"
-    headers = {"Authorization": f"Bearer {LT_TOKEN}"}
-    all_batches = []
-    page = 1
-    limit = 100
-
     print(f"\n[Labeling Tool] Fetching all batch data for {TARGET_LANGUAGE} project (ID: {project_id})...")
 
-    while True:
-        paginated_url = f"{base_url}&limit={limit}&page={page}"
-        try:
-            response = requests.get(paginated_url, headers=headers)
-            response.raise_for_status()
-            json_data = response.json()
-            batches_on_page = json_data.get("data")
-            if not batches_on_page:
-                break
-            all_batches.extend(batches_on_page)
-            if len(batches_on_page) < limit:
-                break
-            page += 1
-        except requests.exceptions.RequestException as e:
-            print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
-            return {}
-
-    # Create a dictionary mapping USER__REPO to batch data
-    batch_data = {}
-    for batch in all_batches:
-        if batch is not None:  # Ensure batch is not None
-            batch_name = batch.get("name", "")
-            if batch_name and "__" in batch_name:
-                batch_data[batch_name] = batch
+    try:
+        snapshot = get_project_batches(project_id, LT_TOKEN, refresh=True)
+    except requests.exceptions.RequestException as e:
+        print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
+        return {}
+
+    # Dictionary mapping USER__REPO to batch data
+    batch_data = snapshot.repo_batches()
 
     print(f"[Labeling Tool] Found {len(batch_data)} batches with valid names")
     return batch_data
@@ -445,6 +415,8 @@ def get_column_indices(header):
             indices[column_key] = found_index
             excel_col = chr(65 + found_index) if found_index < 26 else f"Column {found_index + 1}"
             print(f"  ✓ {column_key:15} -> {excel_col:8} (found header: '{found_header}')")
+        elif config['default_index'] is None:
+            print(f"  - {column_key:15} -> {'n/a':8} (optional, not written; add header {config['headers']} to enable)")
         else:
             indices[column_key] = config['default_index']
             excel_col = chr(65 + config['default_index']) if config['default_index'] < 26 else f"Column {config['default_index'] + 1}"
@@ -496,10 +468,78 @@ def fetch_sheet_data(json_path, spreadsheet_key, scope, sheet_name=None):
 
 LOC_CACHE = {}
 
-def get_lines_count(user_repo):
+def resolve_head_sha(user_repo, branch=None):
+    """
+    Resolve the head commit SHA of a branch (the default branch if None) with
+    one lightweight request. Returns None if it cannot be resolved.
+    """
+    url = f"https://api.github.com/repos/{user_repo}/commits/{branch or 'HEAD'}"
+    try:
+        response = github_get(url, headers={"Accept": "application/vnd.github.sha"})
+        sha = response.text.strip()
+        return sha if len(sha) == 40 else None
+    except RequestException as e:
+        print(f"[LOC Check] Could not resolve head commit for {user_repo}: {e}")
+        return None
+
+def _remember_loc(user_repo, sha, total, languages=None, engine=None, language_bytes=None):
+    """Store a LOC result in the in-memory and persistent caches."""
+    LOC_CACHE[user_repo] = total
+    get_loc_cache().put(user_repo, sha, total, languages, engine, language_bytes)
+
+def try_codetabs_api(user_repo, branch=None, timeout=CODETABS_TIMEOUT):
+    """Try to get LOC from codetabs API with a specific branch"""
+    try:
+        url = f"https://api.codetabs.com/v1/loc?github={user_repo}"
+        if branch:
+            url += f"&branch={branch}"
+        
+        print(f"[LOC Check] Trying API call for {user_repo}" + (f" (branch: {branch})" if branch else ""))
+        response = requests.get(url, timeout=timeout)
+        if response.status_code == 200:
+            data = response.json()
+            total_lines = sum([i['linesOfCode'] for i in data if i['language'].lower().strip() == 'total'])
+            if total_lines > 0:  # Only return if we got a valid number
+                return total_lines
+            print(f"[LOC Check] API returned 0 lines for {user_repo}")
+        else:
+            print(f"[LOC Check] API returned status code {response.status_code} for {user_repo}")
+    except requests.Timeout:
+        print(f"[LOC Check] Timeout while fetching LOC for {user_repo}")
+    except requests.RequestException as e:
+        print(f"[LOC Check] Request failed for {user_repo}: {str(e)}")
+    except json.JSONDecodeError:
+        print(f"[LOC Check] Invalid JSON response for {user_repo}")
+    except Exception as e:
+        print(f"[LOC Check] Unexpected error for {user_repo}: {str(e)}")
+    return None
+
+def try_codetabs_variants(user_repo, branches, timeout=None):
     """
-    Get lines of code for a repository using sequential API calls.
-    Uses caching to avoid repeated API calls.
+    Try the codetabs API for each of ``branches`` in turn and return
+    ``(label, lines)`` for the first non-zero count, or None.
+
+    All variants share one deadline of ``timeout`` seconds (CODETABS_TIMEOUT
+    by default): a variant that fails quickly leaves the rest of the budget to
+    the next one, and a slow one uses it up. Nothing runs in the background,
+    so no request outlives the call.
+    """
+    deadline = time.monotonic() + (CODETABS_TIMEOUT if timeout is None else timeout)
+    for branch in branches:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"[LOC Check] codetabs time budget used up for {user_repo}")
+            break
+        lines = try_codetabs_api(user_repo, branch, remaining)
+        if lines:
+            return branch or 'no branch', lines
+    return None
+
+def get_cached_lines_count(user_repo, default_branch=None):
+    """
+    Look up an exact LOC count in the in-run and persistent caches.
+    Returns ``(lines, head_sha)``: ``lines`` is None on a miss, and ``head_sha``
+    is the resolved head commit (None if unknown) for the count that follows.
     """
     start_time = time.time()
     print(f"\n[LOC Check] Starting LOC check for {user_repo}...")
@@ -508,68 +548,66 @@ def get_lines_count(user_repo):
     if user_repo in LOC_CACHE:
         elapsed_time = time.time() - start_time
         print(f"[LOC Check] Retrieved from cache in {elapsed_time:.2f} seconds")
-        return LOC_CACHE[user_repo]
-
-    def try_codetabs_api(branch=None):
-        """Try to get LOC from codetabs API with a specific branch"""
-        try:
-            url = f"https://api.codetabs.com/v1/loc?github={user_repo}"
-            if branch:
-                url += f"&branch={branch}"
-            
-            print(f"[LOC Check] Trying API call for {user_repo}" + (f" (branch: {branch})" if branch else ""))
-            response = requests.get(url, timeout=600)  # 10 minute timeout
-            if response.status_code == 200:
-                data = response.json()
-                total_lines = sum([i['linesOfCode'] for i in data if i['language'].lower().strip() == 'total'])
-                if total_lines > 0:  # Only return if we got a valid number
-                    return total_lines
-                print(f"[LOC Check] API returned 0 lines for {user_repo}")
-            else:
-                print(f"[LOC Check] API returned status code {response.status_code} for {user_repo}")
-        except requests.Timeout:
-            print(f"[LOC Check] Timeout while fetching LOC for {user_repo}")
-        except requests.RequestException as e:
-            print(f"[LOC Check] Request failed for {user_repo}: {str(e)}")
-        except json.JSONDecodeError:
-            print(f"[LOC Check] Invalid JSON response for {user_repo}")
-        except Exception as e:
-            print(f"[LOC Check] Unexpected error for {user_repo}: {str(e)}")
-        return None
+        return LOC_CACHE[user_repo], None
 
-    def get_default_branch(owner_repo):
-        """Get default branch from GitHub API"""
-        try:
-            url = f"https://api.github.com/repos/{owner_repo}"
-            response = make_github_api_request(url)
-            return response.json()["default_branch"]
-        except (RequestException, KeyError):
-            return "main"  # Fallback to main
-
-    # Try methods sequentially
-    # 1. Try without branch first
-    result = try_codetabs_api()
-    if result is not None:
-        LOC_CACHE[user_repo] = result
+    loc_cache = get_loc_cache()
+    head_sha = resolve_head_sha(user_repo, default_branch)
+    if head_sha:
+        cached = loc_cache.get(user_repo, head_sha)
+    else:
+        # The head is unknown: accept a recent count of any commit of this repo
+        cached = loc_cache.get_recent(user_repo)
+    if cached:
+        LOC_CACHE[user_repo] = cached['total']
         elapsed_time = time.time() - start_time
-        print(f"[LOC Check] Completed in {elapsed_time:.2f} seconds")
-        return result
+        commit = f"commit {cached['sha'][:7]}" if cached['sha'] else "unknown commit"
+        print(f"[LOC Check] Retrieved from persistent cache ({commit}, {cached['age_days']:.1f} days old) "
+              f"in {elapsed_time:.2f} seconds")
+        return cached['total'], head_sha
+    return None, head_sha
 
-    # 2. Try with main branch
-    result = try_codetabs_api("main")
-    if result is not None:
-        LOC_CACHE[user_repo] = result
-        elapsed_time = time.time() - start_time
-        print(f"[LOC Check] Completed in {elapsed_time:.2f} seconds")
-        return result
+def get_lines_count(user_repo, default_branch=None, language_bytes=None, lookup=None):
+    """
+    Get lines of code for a repository.
+    Results are kept in a persistent cache keyed by the head commit SHA, so a
+    repo whose default branch has not moved is never counted twice. ``lookup``
+    is the get_cached_lines_count result if the caller already checked the caches.
+    With LOC_ENGINE = 'tarball' the GitHub archive is streamed and counted
+    in memory, and with 'local' the repo is shallow-cloned and counted (see
+    loc_counter.py); the codetabs API is only used if that fails. Its branch
+    variants share one CODETABS_TIMEOUT (see try_codetabs_variants).
+    language_bytes (GitHub's /languages payload) is stored with the count to
+    calibrate loc_estimator.
+    """
+    start_time = time.time()
+    cached_lines, head_sha = lookup or get_cached_lines_count(user_repo, default_branch)
+    if cached_lines is not None:
+        return cached_lines
 
-    # 3. Try with default branch
-    default_branch = get_default_branch(user_repo)
-    result = try_codetabs_api(default_branch)
-    if result is not None:
-        LOC_CACHE[user_repo] = result
+    if LOC_ENGINE in ('tarball', 'local'):
+        if LOC_ENGINE == 'tarball':
+            local_result = count_repo_lines_from_tarball(user_repo, head_sha)
+        else:
+            local_result = count_repo_lines(user_repo, default_branch)
+        if local_result and local_result['total'] > 0:
+            _remember_loc(user_repo, head_sha, local_result['total'], local_result['languages'], LOC_ENGINE,
+                          language_bytes)
+            elapsed_time = time.time() - start_time
+            print(f"[LOC Check] Completed locally in {elapsed_time:.2f} seconds")
+            return local_result['total']
+        print(f"[LOC Check] Local count failed for {user_repo}; falling back to codetabs API")
+
+    # The default branch from repo_data first, then the unqualified and 'main' requests
+    branches = []
+    for branch in (default_branch, None, 'main'):
+        if branch not in branches:
+            branches.append(branch)
+    winner = try_codetabs_variants(user_repo, branches)
+    if winner is not None:
+        label, result = winner
+        _remember_loc(user_repo, head_sha, result, engine="codetabs", language_bytes=language_bytes)
         elapsed_time = time.time() - start_time
-        print(f"[LOC Check] Completed in {elapsed_time:.2f} seconds")
+        print(f"[LOC Check] Completed in {elapsed_time:.2f} seconds ({label})")
         return result
 
     # If all methods fail, return None
@@ -592,10 +630,10 @@ def get_repo_details(user_repo):
     languages_url = f"https://api.github.com/repos/{user}/{repo}/languages"
     
     try:
-        repo_response = make_github_api_request(api_url)
+        repo_response = make_github_api_request(api_url, cache=True)
         repo_data = repo_response.json()
         
-        languages_response = make_github_api_request(languages_url)
+        languages_response = make_github_api_request(languages_url, cache=True)
         languages_data = languages_response.json()
         
         elapsed_time = time.time() - start_time
@@ -613,28 +651,26 @@ def get_repo_details(user_repo):
 
 # --- Evaluation Logic ---
 
-def get_required_loc_for_stars(stars, loc_thresholds):
+def get_required_loc_for_stars(stars, sorted_thresholds):
     """
-    Get the required LOC based on star count using the threshold mapping.
+    Get the required LOC based on star count, using the (stars, LOC) pairs of
+    get_sorted_loc_thresholds (highest star count first).
     """
-    # Sort thresholds by star count (descending) to find the appropriate threshold
-    sorted_thresholds = sorted(loc_thresholds.items(), reverse=True)
-    
     for threshold_stars, required_loc in sorted_thresholds:
         if stars >= threshold_stars:
             return required_loc
     
     # If stars are below the minimum threshold, return the highest required LOC
-    return max(loc_thresholds.values())
+    return max(required_loc for _, required_loc in sorted_thresholds)
 
 def get_language_evaluation_settings(language_name: str):
     """
     Get evaluation settings for a specific language.
     """
-    from config_utils import get_language_evaluation_config, get_loc_thresholds
+    from config_utils import get_language_evaluation_config, get_sorted_loc_thresholds
     
     eval_config = get_language_evaluation_config(language_name)
-    loc_thresholds = get_loc_thresholds(language_name)
+    loc_thresholds = get_sorted_loc_thresholds(language_name)
     
     return {
         'min_percentage': eval_config['min_percentage'],
@@ -642,7 +678,7 @@ def get_language_evaluation_settings(language_name: str):
         'loc_thresholds': loc_thresholds
     }
 
-def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, row_number=None):
+def evaluate_repo(user_repo, sheet_index, existing_lt_repos, row_number=None):
     """
     Evaluates a single repository based on a set of criteria.
     Returns a dictionary with detailed results of each check.
@@ -655,7 +691,7 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
     results = {
         'repo': user_repo, 'should_add': False, 'reason': "",
         'language_name': "N/A", 'language_percent': 0, 'star_count': 0, 
-        'loc_count': "N/A", 'already_exists': "No", 'manual_review': False,
+        'loc_count': "N/A", 'loc_source': "", 'already_exists': "No", 'manual_review': False,
     }
 
     # 1. Check if it already exists in the labeling tool
@@ -666,25 +702,11 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
         return results
 
     # 2. Check if it already exists in the sheet as a processed repo (marked as 'Yes' in Added column)
-    repo_url_col_name = f"col_{column_indices['repo_url']}"
-    added_col_name = f"col_{column_indices['added']}"
-    
-    # Ensure columns exist before filtering
-    if repo_url_col_name in all_repos_df.columns and added_col_name in all_repos_df.columns:
-        repo_url_lower = f"https://github.com/{user_repo}".lower()
-        
-        # Normalize URLs in the DataFrame for comparison
-        normalized_urls = all_repos_df[repo_url_col_name].str.lower().str.strip()
-
-        # Find matching rows and check if any are marked as 'Yes'
-        matching_rows = all_repos_df[normalized_urls == repo_url_lower]
-        if not matching_rows.empty:
-            # Check if any matching rows are already marked as 'Yes' in the added column
-            if matching_rows[added_col_name].str.lower().eq('yes').any():
-                results['reason'] = "Exists in Sheet"
-                results['already_exists'] = "Yes"
-                print(f"=== Evaluation completed in {time.time() - start_time:.2f} seconds ===\n")
-                return results
+    if sheet_index.is_added(f"https://github.com/{user_repo}"):
+        results['reason'] = "Exists in Sheet"
+        results['already_exists'] = "Yes"
+        print(f"=== Evaluation completed in {time.time() - start_time:.2f} seconds ===\n")
+        return results
 
     # 3. Fetch repo details (language and stars)
     details = get_repo_details(user_repo)
@@ -725,10 +747,37 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
     lines = None
     if target_lang_percent >= eval_settings['min_percentage'] and stars >= eval_settings['min_stars']:
         print(f"[LOC Check] Running LOC check for {user_repo}{row_info} (Language: {target_lang_percent:.2f}%, Stars: {stars})")
-        lines = get_lines_count(user_repo)
+        required_loc = get_required_loc_for_stars(stars, eval_settings['loc_thresholds'])
+        default_branch = details['repo_data'].get('default_branch')
+        # An exact count stored by an earlier run always beats an estimate
+        lookup = get_cached_lines_count(user_repo, default_branch)
+        verdict, estimate = None, None
+        if lookup[0] is None and LOC_ESTIMATOR:
+            verdict, estimate = get_loc_estimator().classify(languages_data, required_loc)
+        if verdict:
+            # The whole confidence interval is on one side of the threshold: the exact count cannot change the result
+            print(f"[LOC Check] Estimated {estimate['estimate']:,} LOC "
+                  f"({estimate['low']:,}-{estimate['high']:,}) is clearly {verdict} {required_loc:,}; skipping exact count")
+            lines = estimate['estimate']
+        else:
+            if estimate:
+                print(f"[LOC Check] Estimated {estimate['low']:,}-{estimate['high']:,} LOC is borderline "
+                      f"for {required_loc:,}; counting exactly")
+            if lookup[0] is not None:
+                lines = lookup[0]
+            else:
+                with LOC_SLOTS:
+                    lines = get_lines_count(user_repo, default_branch, languages_data, lookup)
         
         # Handle LOC results
-        if lines is None:
+        if verdict:
+            # The LOC cell stays numeric; a note on it (and the LOC Source column, if any) marks the estimate
+            results['loc_count'] = lines
+            results['loc_source'] = "Estimate"
+            results['loc_note'] = (f"Estimated from GitHub's language byte counts "
+                                   f"(range {estimate['low']:,}-{estimate['high']:,}), not an exact count.")
+            loc_check_passed = verdict == 'above'
+        elif lines is None:
             results['loc_count'] = "ERROR"
             loc_check_passed = False
         elif lines == 0:
@@ -736,7 +785,7 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
             loc_check_passed = False
         else:
             results['loc_count'] = lines
-            required_loc = get_required_loc_for_stars(stars, eval_settings['loc_thresholds'])
+            results['loc_source'] = "Exact"
             if lines >= required_loc:
                 loc_check_passed = True
             else:
@@ -775,7 +824,7 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
             reasons.append(f"Stars < {stars}")
         if not loc_check_passed and lines is not None:
             required_loc = get_required_loc_for_stars(stars, eval_settings['loc_thresholds'])
-            reasons.append(f"LOC < {required_loc:,}")
+            reasons.append(f"LOC < {required_loc:,}" + (" (estimated)" if results['loc_source'] == "Estimate" else ""))
         results['reason'] = ", ".join(reasons)
     else:
         results['reason'] = "All checks passed."
@@ -785,47 +834,105 @@ def evaluate_repo(user_repo, all_repos_df, column_indices, existing_lt_repos, ro
 
 # --- Google Sheets Output ---
 
-def update_sheet_with_results(json_path, spreadsheet_key, scope, sheet_name, repo_url, results, column_indices):
+def result_cells(row_number, results, column_indices):
+    """Return the ``(row, col, value)`` cells (1-based) that record a result in its sheet row."""
+    final_verdict = "Manual" if results.get('manual_review') else ("Yes" if results['should_add'] else "No")
+    cells = [
+        (row_number, column_indices['majority_language'] + 1, results['language_name']),
+        (row_number, column_indices['percentage'] + 1, results['language_percent']),
+        (row_number, column_indices['stars'] + 1, results['star_count']),
+        (row_number, column_indices['loc'] + 1, str(results['loc_count'])),
+        (row_number, column_indices['already_exists'] + 1, results['already_exists']),
+        (row_number, column_indices['logical_checks'] + 1, final_verdict),
+    ]
+    if 'loc_source' in column_indices:
+        cells.append((row_number, column_indices['loc_source'] + 1, results.get('loc_source', '')))
+    return cells
+
+def result_notes(row_number, results, column_indices):
+    """Return ``{a1: note}`` for cells that need a note: an estimated LOC is flagged on the cell itself."""
+    if not results.get('loc_note'):
+        return {}
+    return {gspread.utils.rowcol_to_a1(row_number, column_indices['loc'] + 1): results['loc_note']}
+
+class SheetResultWriter:
     """
-    Updates a single row in the Google Sheet with the evaluation results.
+    Buffers evaluation results and writes them to the sheet in batches.
+
+    Rows are addressed by the row numbers known from fetch_sheet_data, so no
+    column has to be read back. Buffered cells go out in one batch_update
+    every SHEET_FLUSH_EVERY results or SHEET_FLUSH_SECONDS seconds, and on
+    close. A failed flush keeps its cells for the next attempt.
     """
-    try:
-        client = _get_gspread_client(json_path, scope)
-        sheet = client.open_by_key(spreadsheet_key).worksheet(sheet_name)
 
-        url_column_index = column_indices['repo_url'] + 1
-        url_column_values = sheet.col_values(url_column_index)
-        
-        try:
-            row_index = url_column_values.index(repo_url) + 1
-        except ValueError:
-            print(colored(f"Could not find URL {repo_url} in the sheet to update.", "red"))
-            return
+    def __init__(self, sheet, column_indices, flush_every=None, flush_seconds=None):
+        self.sheet = sheet
+        self.column_indices = column_indices
+        self.flush_every = flush_every or SHEET_FLUSH_EVERY
+        self.flush_seconds = flush_seconds or SHEET_FLUSH_SECONDS
+        self._pending = []  # (repo, cells)
+        self._last_flush = time.monotonic()
+        self.stats = {'rows': 0, 'batches': 0, 'failed_batches': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def add(self, row_number, results):
+        self._pending.append((
+            results['repo'],
+            result_cells(row_number, results, self.column_indices),
+            result_notes(row_number, results, self.column_indices),
+        ))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+        else:
+            self.flush_if_due()
 
-        final_verdict = "Manual" if results.get('manual_review') else ("Yes" if results['should_add'] else "No")
-        
-        cell_updates = [
-            gspread.Cell(row_index, column_indices['majority_language'] + 1, results['language_name']),
-            gspread.Cell(row_index, column_indices['percentage'] + 1, results['language_percent']),
-            gspread.Cell(row_index, column_indices['stars'] + 1, results['star_count']),
-            gspread.Cell(row_index, column_indices['loc'] + 1, str(results['loc_count'])),
-            gspread.Cell(row_index, column_indices['already_exists'] + 1, results['already_exists']),
-            gspread.Cell(row_index, column_indices['logical_checks'] + 1, final_verdict),
+    def flush_if_due(self):
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        data = [
+            {'range': gspread.utils.rowcol_to_a1(row, col), 'values': [[value]]}
+            for _, cells, _ in self._pending
+            for row, col, value in cells
         ]
-        
-        sheet.update_cells(cell_updates, value_input_option='USER_ENTERED')
-        print(colored(f"Successfully updated sheet for {results['repo']}.", "blue"))
+        notes = {a1: note for _, _, row_notes in self._pending for a1, note in row_notes.items()}
+        try:
+            self.sheet.batch_update(data, value_input_option='USER_ENTERED')
+            if notes:
+                self.sheet.update_notes(notes)  # Values and notes are idempotent, so a retry resends both
+        except Exception as e:
+            self.stats['failed_batches'] += 1
+            print(colored(f"Failed to write {len(self._pending)} results to the sheet (will retry): {e}", "red"))
+            return
+        self.stats['rows'] += len(self._pending)
+        self.stats['batches'] += 1
+        print(colored(f"Wrote {len(self._pending)} results to the sheet in one batch.", "blue"))
+        self._pending = []
 
-    except Exception as e:
-        print(colored(f"Failed to update sheet for {results['repo']}: {e}", "red"))
+    def close(self):
+        self.flush()
+        if self._pending:
+            repos = ", ".join(repo for repo, _, _ in self._pending)
+            print(colored(f"Could not write results for: {repos}", "red"))
 
 # --- Duplicate Detection ---
 
-def preprocess_duplicates(df, column_indices, existing_lt_repos):
+def preprocess_duplicates(df, column_indices, existing_lt_repos, sheet_index):
     """
     Preprocesses the DataFrame to identify and mark duplicate repositories.
     Marks all instances except the first occurrence as duplicates.
     Also checks against existing repos in the labeling tool.
+    Returns the marked DataFrame and the (row, col, value) cells that changed.
     """
     print("--- Preprocessing Duplicates ---")
     
@@ -835,54 +942,30 @@ def preprocess_duplicates(df, column_indices, existing_lt_repos):
     user_repo_col_idx = column_indices['user_repo']
     
     repo_url_col_name = f"col_{repo_url_col_idx}"
-    already_exists_col_name = f"col_{already_exists_col_idx}"
-    logical_checks_col_name = f"col_{logical_checks_col_idx}"
     user_repo_col_name = f"col_{user_repo_col_idx}"
     
     # Ensure we have enough columns
     if len(df.columns) <= max(repo_url_col_idx, already_exists_col_idx, logical_checks_col_idx, user_repo_col_idx):
         print(colored("Warning: Not enough columns to perform duplicate preprocessing", "yellow"))
-        return df
-    
-    # Get all repository URLs and normalize them
-    df_copy = df.copy()
-    normalized_urls = df_copy[repo_url_col_name].str.lower().str.strip()
+        return df, []
     
-    # Find duplicates within the sheet
-    duplicate_mask = normalized_urls.duplicated(keep='first')  # Keep first occurrence, mark rest as duplicates
-    # Exclude blank/empty URLs from being considered duplicates
-    duplicate_mask &= normalized_urls != ""
-    duplicate_count = duplicate_mask.sum()
+    df_copy, lt_mask, duplicate_mask, changed_cells = mark_duplicates(df, column_indices, existing_lt_repos)
+    duplicate_count = int(duplicate_mask.sum())
+    lt_duplicate_count = int(lt_mask.sum())
     
-    # Check against labeling tool existing repos
-    lt_duplicate_count = 0
-    for idx, row in df_copy.iterrows():
-        user_repo_val = row.iloc[user_repo_col_idx] if user_repo_col_idx < len(row) else ''
-        if isinstance(user_repo_val, str) and '/' in user_repo_val.strip():
-            user_repo_clean = user_repo_val.strip().lower()
-            if user_repo_clean in existing_lt_repos:
-                df_copy.loc[idx, already_exists_col_name] = "Yes"
-                df_copy.loc[idx, logical_checks_col_name] = "No"
-                lt_duplicate_count += 1
-                print(f"  Found in labeling tool: {user_repo_val}")
+    for user_repo_val in df.loc[lt_mask, user_repo_col_name]:
+        print(f"  Found in labeling tool: {user_repo_val}")
     
     if duplicate_count > 0:
         print(f"Found {duplicate_count} duplicate repositories within the sheet")
         
-        # Mark duplicates in the DataFrame
-        df_copy.loc[duplicate_mask, already_exists_col_name] = "Yes"
-        df_copy.loc[duplicate_mask, logical_checks_col_name] = "No"
-        
         # Print duplicate information
-        duplicate_urls = normalized_urls[duplicate_mask].unique()
+        duplicate_urls = df.loc[duplicate_mask, repo_url_col_name].map(normalize_url).unique()
         for url in duplicate_urls:
-            if pd.notna(url) and url.strip():
-                matching_indices = normalized_urls[normalized_urls == url].index.tolist()
-                first_row = matching_indices[0] + 2  # Convert to sheet row number
-                duplicate_rows = [idx + 2 for idx in matching_indices[1:]]  # Convert to sheet row numbers
-                print(f"  Duplicate found: {url}")
-                print(f"    First occurrence: Row {first_row}")
-                print(f"    Duplicates marked: Rows {duplicate_rows}")
+            matching_indices = sheet_index.rows_by_url[url]
+            print(f"  Duplicate found: {url}")
+            print(f"    First occurrence: Row {matching_indices[0] + 2}")  # Convert to sheet row number
+            print(f"    Duplicates marked: Rows {[idx + 2 for idx in matching_indices[1:]]}")
     
     if lt_duplicate_count > 0:
         print(f"Found {lt_duplicate_count} repositories that already exist in labeling tool")
@@ -891,7 +974,7 @@ def preprocess_duplicates(df, column_indices, existing_lt_repos):
     if total_duplicates == 0:
         print("No duplicates found")
     
-    return df_copy
+    return df_copy, changed_cells
 
 def print_column_configuration():
     """
@@ -912,6 +995,9 @@ def print_column_configuration():
     print(f"Min Stars: {eval_config['min_stars']}")
     print(f"Min Language Percentage: {eval_config['min_percentage']}%")
     print(f"Labeling Tool Project ID: {LANG_CONFIG['project_id']}")
+    print(f"LOC Engine: {LOC_ENGINE}")
+    print(f"LOC Estimator: {'on' if LOC_ESTIMATOR else 'off'}")
+    print(f"Concurrency: {EVAL_WORKERS} repo workers, {LOC_CONCURRENCY} concurrent LOC counts")
     print("-" * 80)
     print("LOC Thresholds:")
     for stars, loc in sorted(loc_thresholds.items()):
@@ -921,7 +1007,10 @@ def print_column_configuration():
     print("-" * 80)
     
     for column_key, config in COLUMN_CONFIG.items():
-        excel_col = chr(65 + config['default_index']) if config['default_index'] < 26 else f"Col {config['default_index'] + 1}"
+        if config['default_index'] is None:
+            excel_col = "optional"
+        else:
+            excel_col = chr(65 + config['default_index']) if config['default_index'] < 26 else f"Col {config['default_index'] + 1}"
         headers_str = ", ".join(config['headers'])
         if len(headers_str) > 24:
             headers_str = headers_str[:21] + "..."
@@ -932,6 +1021,32 @@ def print_column_configuration():
 
 # --- Main Execution ---
 
+def evaluate_row(output, user_repo, repo_url, sheet_index, existing_lt_repos, row_number):
+    """
+    Evaluate one sheet row on a worker thread, capturing its console output.
+    Returns ``{'row_number', 'repo_url', 'result', 'log'}``; ``result`` is None
+    if the row was skipped or failed.
+    """
+    user_repo = user_repo.strip()
+    result = None
+    with output.capture() as log:
+        try:
+            if '/' in user_repo:
+                result = evaluate_repo(user_repo, sheet_index, existing_lt_repos, row_number)
+                
+                # Print to console
+                if result['should_add']:
+                    print(colored(f"✔ ADD:       {result['repo']} (Row {row_number})", "green"), f"- {result['reason']}")
+                else:
+                    print(colored(f"✖ DON'T ADD: {result['repo']} (Row {row_number})", "yellow"), f"- {result['reason']}")
+            else:
+                print(colored(f"✖ SKIPPING:  Row {row_number}", "red"), f"- Malformed user/repo from Column A: '{user_repo}'")
+
+        except Exception as e:
+            result = None
+            print(colored(f"✖ ERROR:     {repo_url} (Row {row_number})", "red"), f"- {str(e)}")
+    return {'row_number': row_number, 'repo_url': repo_url, 'result': result, 'log': log.getvalue()}
+
 def main():
     """
     Main script to process a list of repos from a Google Sheet and evaluate them.
@@ -972,101 +1087,89 @@ def main():
     update_data_from_LT(CREDS_JSON_PATH, SPREADSHEET_KEY, SCOPE, SHEET_NAME, column_indices)
 
     # 5. Preprocess duplicates - mark all duplicate repositories except the first occurrence
-    potential_repos_df = preprocess_duplicates(potential_repos_df, column_indices, existing_lt_repos)
+    sheet_index = SheetIndex(potential_repos_df, column_indices)
+    potential_repos_df, changed_cells = preprocess_duplicates(potential_repos_df, column_indices, existing_lt_repos, sheet_index)
 
-    # 6. Update sheet with duplicate markings
-    try:
-        client = _get_gspread_client(CREDS_JSON_PATH, SCOPE)
-        sheet = client.open_by_key(SPREADSHEET_KEY).worksheet(SHEET_NAME)
-        
-        # Update Already Exists and Logical Checks columns for duplicates
-        already_exists_col_idx = column_indices['already_exists'] + 1  # +1 for 1-based indexing
-        logical_checks_col_idx = column_indices['logical_checks'] + 1  # +1 for 1-based indexing
-        
-        already_exists_col_name = f"col_{column_indices['already_exists']}"
-        logical_checks_col_name = f"col_{column_indices['logical_checks']}"
-        
-        # Find rows that were marked as duplicates
-        duplicate_rows = potential_repos_df[
-            (potential_repos_df[already_exists_col_name] == "Yes") & 
-            (potential_repos_df[logical_checks_col_name] == "No")
-        ]
-        
-        if not duplicate_rows.empty:
-            print(f"Updating {len(duplicate_rows)} duplicate rows in the sheet...")
-            cell_updates = []
-            
-            for idx, row in duplicate_rows.iterrows():
-                sheet_row = idx + 2  # Convert to sheet row number (0-based index + 1 for header + 1 for 1-based)
-                cell_updates.extend([
-                    gspread.Cell(sheet_row, already_exists_col_idx, "Yes"),
-                    gspread.Cell(sheet_row, logical_checks_col_idx, "No")
-                ])
-            
-            # Batch update for efficiency
-            if cell_updates:
-                sheet.update_cells(cell_updates, value_input_option='USER_ENTERED')
-                print(colored(f"Successfully marked {len(duplicate_rows)} duplicates in the sheet.", "blue"))
-        
-    except Exception as e:
-        print(colored(f"Error updating sheet with duplicate markings: {e}", "red"))
+    # 6. Update sheet with duplicate markings (only the cells whose value changed)
+    if changed_cells:
+        try:
+            client = _get_gspread_client(CREDS_JSON_PATH, SCOPE)
+            sheet = client.open_by_key(SPREADSHEET_KEY).worksheet(SHEET_NAME)
+            print(f"Updating {len(changed_cells)} duplicate cells in the sheet...")
+            cell_updates = [gspread.Cell(row, col, value) for row, col, value in changed_cells]
+            sheet.update_cells(cell_updates, value_input_option='USER_ENTERED')
+            print(colored(f"Successfully marked {len({row for row, _, _ in changed_cells})} duplicates in the sheet.", "blue"))
+        except Exception as e:
+            print(colored(f"Error updating sheet with duplicate markings: {e}", "red"))
 
     # 7. Resume Logic: Find rows that need processing
     # A row needs processing if 'Logical Checks' column is empty and URL is not empty.
-    unprocessed_rows = []
     user_repo_col_idx = column_indices['user_repo']
     repo_url_col_idx = column_indices['repo_url']
     logical_checks_col_idx = column_indices['logical_checks']
 
-    if len(potential_repos_df.columns) > max(user_repo_col_idx, repo_url_col_idx, logical_checks_col_idx):
-        for index, row in potential_repos_df.iterrows():
-            user_repo_val = row.iloc[user_repo_col_idx] if user_repo_col_idx < len(row) else ''
-            logical_check_val = row.iloc[logical_checks_col_idx] if logical_checks_col_idx < len(row) else ''
-
-            user_repo_present = isinstance(user_repo_val, str) and '/' in user_repo_val.strip()
-            logical_check_empty = pd.isna(logical_check_val) or str(logical_check_val).strip() == ''
-            
-            if user_repo_present and logical_check_empty:
-                unprocessed_rows.append((index, row)) # Keep original index and data
-    else:
+    if len(potential_repos_df.columns) <= max(user_repo_col_idx, repo_url_col_idx, logical_checks_col_idx):
         print(colored(f"Error: Not enough columns in the sheet to find required columns.", "red"))
         return
+    unprocessed_indices = unprocessed_row_indices(potential_repos_df, column_indices)
+    unprocessed_rows = list(zip(
+        unprocessed_indices,
+        potential_repos_df.loc[unprocessed_indices, f"col_{user_repo_col_idx}"],
+        potential_repos_df.loc[unprocessed_indices, f"col_{repo_url_col_idx}"],
+    ))
         
     print(f"Found {len(unprocessed_rows)} unprocessed repositories to evaluate.")
 
-    # 8. Loop through and evaluate each unprocessed repository
-    print("\n--- Evaluation Results ---")
-    for index, row in unprocessed_rows:
-        user_repo = row.iloc[column_indices['user_repo']].strip()
-        repo_url = row.iloc[column_indices['repo_url']]
-        row_number = index + 2  # +2 because index is 0-based and we skip header row
-
-        try:
-            if '/' in user_repo:
-                result = evaluate_repo(user_repo, potential_repos_df, column_indices, existing_lt_repos, row_number)
-                
-                # Print to console
-                if result['should_add']:
-                    print(colored(f"✔ ADD:       {result['repo']} (Row {row_number})", "green"), f"- {result['reason']}")
-                else:
-                    print(colored(f"✖ DON'T ADD: {result['repo']} (Row {row_number})", "yellow"), f"- {result['reason']}")
+    # 8. Evaluate the unprocessed repositories concurrently
+    # Each worker buffers its own console output, which is printed as one block
+    # together with the verdict when the repo finishes; results are handed to
+    # the batched sheet writer from this thread as they come in.
+    try:
+        client = _get_gspread_client(CREDS_JSON_PATH, SCOPE)
+        sheet = client.open_by_key(SPREADSHEET_KEY).worksheet(SHEET_NAME)
+    except Exception as e:
+        print(colored(f"Error opening sheet for results: {e}", "red"))
+        return
 
-                # Write results back to the sheet
-                update_sheet_with_results(
-                    CREDS_JSON_PATH,
-                    SPREADSHEET_KEY,
-                    SCOPE,
-                    SHEET_NAME,
-                    repo_url,
-                    result,
-                    column_indices,
-                )
-            else:
-                print(colored(f"✖ SKIPPING:  Row {row_number}", "red"), f"- Malformed user/repo from Column A: '{user_repo}'")
+    print(f"\n--- Evaluation Results ({EVAL_WORKERS} workers, {LOC_CONCURRENCY} concurrent LOC counts) ---")
+    with ThreadOutput() as output, SheetResultWriter(sheet, column_indices) as writer:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=EVAL_WORKERS)
+        futures = [
+            executor.submit(evaluate_row, output, user_repo, repo_url, sheet_index, existing_lt_repos, index + 2)
+            for index, user_repo, repo_url in unprocessed_rows  # +2 because index is 0-based and we skip header row
+        ]
+        handed_over = set()
 
-        except Exception as e:
-            print(colored(f"✖ ERROR:     {repo_url} (Row {row_number})", "red"), f"- {str(e)}")
+        def hand_over(future):
+            handed_over.add(future)
+            outcome = future.result()
+            output.emit(outcome['log'])
+            if outcome['result'] is not None:
+                writer.add(outcome['row_number'], outcome['result'])
 
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=writer.flush_seconds, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    hand_over(future)
+                    print(f"[GitHub Budget] {format_status(get_rate_limit_status())}")
+                writer.flush_if_due()
+        finally:
+            # On Ctrl-C or an unexpected error, drop the queued rows instead of evaluating all of
+            # them, wait only for the rows already running, and write every finished result
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future in futures:
+                if future not in handed_over and not future.cancelled() and future.exception() is None:
+                    hand_over(future)
+
+    print(f"[Sheet Writer] {writer.stats['rows']} results written in {writer.stats['batches']} batches"
+          f" ({writer.stats['failed_batches']} failed attempts)")
+    print(f"[LOC Cache] {get_loc_cache().format_stats()}")
+    if LOC_ESTIMATOR:
+        print(f"[LOC Estimator] {get_loc_estimator().format_stats()}")
     print("\n--- Evaluation Complete ---")
 
 
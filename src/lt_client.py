@@ -0,0 +1,341 @@
+"""
+Shared labeling-tool (LT) client.
+
+Several stages need the batches of an LT project: ``logical_repo_checks``
+(existing repos and the sheet sync), ``update_from_LT``,
+``get_existing_repos`` and ``convert.py``. Each used to page through
+``/api/batches`` on its own, some of them twice per run. Here a project's
+batches are fetched once into a :class:`ProjectBatches` snapshot that holds
+the repo-name and batch-id indexes. The snapshot is kept in memory for the rest of
+the run and on disk for ``SNAPSHOT_TTL_SECONDS``, so back-to-back stages and
+reruns do not page through the API again. Steps that copy batch stats into
+the sheet pass ``refresh=True`` so they never write stale numbers.
+
+The token is passed in by the caller, because the stages read it from
+different places (``config_utils.get_lt_token`` or ``convert.LT_TOKEN``).
+
+List endpoints are read with :func:`iter_pages`: page 1 reports
+``pageCount``, the remaining pages are fetched concurrently over one pooled
+session, and the items are yielded in page order as the pages arrive.
+:func:`build_conversation_index` reads the conversations of several projects
+in one listing and maps each batch to the PR ids it already holds.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- LT Client Configuration ---
+LT_API_URL = "https://eval.turing.com/api"
+BATCHES_URL = f"{LT_API_URL}/batches?sort%5B0%5D=createdAt%2CDESC&join%5B0%5D=batchStats&join%5B1%5D=importAttempts"
+CONVERSATIONS_URL = f"{LT_API_URL}/conversations?join%5B0%5D=project%7C%7Cid%2Cname&join%5B1%5D=batch%7C%7Cid%2Cname&join%5B2%5D=seed%7C%7Cmetadata"
+PAGE_LIMIT = 100
+PAGE_FETCH_WORKERS = 8  # Concurrent page requests per listing (also the number of pages held ahead of the consumer)
+REQUEST_TIMEOUT = (10, 120)  # Seconds to connect / to wait for the server between bytes
+SNAPSHOT_TTL_SECONDS = 10 * 60  # On-disk snapshots younger than this are reused by the next run
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), '.cache', 'lt_batches')
+
+
+class ProjectBatches:
+    """All batches of one LT project, indexed by batch name and id."""
+
+    def __init__(self, project_id, batches, fetched_at=None):
+        self.project_id = project_id
+        self.batches = [batch for batch in batches if batch]
+        self.fetched_at = fetched_at or time.time()
+        self.by_name = {}  # USER__REPO -> batch
+        self.by_id = {}
+        for batch in self.batches:
+            if batch.get("name"):
+                self.by_name[batch["name"]] = batch  # Like the old per-stage dicts, the last listed batch wins
+            if batch.get("id") is not None:
+                self.by_id[batch["id"]] = batch
+        # Lower-cased USER/REPO names, for case-insensitive membership checks
+        self.repo_names = frozenset(name.replace("__", "/").lower() for name in self.by_name if "__" in name)
+
+    def get_by_repo(self, user_repo):
+        """Return the batch of a ``USER/REPO`` name, or None."""
+        return self.by_name.get(user_repo.replace("/", "__"))
+
+    def repo_batches(self):
+        """Return ``{USER__REPO: batch}`` for every batch named after a repository."""
+        return {name: batch for name, batch in self.by_name.items() if "__" in name}
+
+    def age_seconds(self):
+        return time.time() - self.fetched_at
+
+
+_SNAPSHOTS = {}
+_SNAPSHOT_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _project_lock(project_id):
+    with _LOCKS_GUARD:
+        return _SNAPSHOT_LOCKS.setdefault(project_id, threading.Lock())
+
+
+def _snapshot_path(project_id):
+    return os.path.join(SNAPSHOT_DIR, f"project_{project_id}.json")
+
+
+def _read_stored(path, max_age):
+    """Return a stored ``{'fetched_at', ...}`` payload younger than ``max_age`` seconds, or None."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if time.time() - stored.get('fetched_at', 0) > max_age:
+        return None
+    return stored
+
+
+def _write_stored(path, payload):
+    """Write a payload atomically; a failed write only costs the next run a refetch."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Labeling Tool] Could not store {os.path.basename(path)}: {e}")
+
+
+def _load_from_disk(project_id, max_age):
+    stored = _read_stored(_snapshot_path(project_id), max_age)
+    if stored is None:
+        return None
+    return ProjectBatches(project_id, stored.get('batches') or [], stored['fetched_at'])
+
+
+def _save_to_disk(snapshot):
+    _write_stored(_snapshot_path(snapshot.project_id),
+                  {'fetched_at': snapshot.fetched_at, 'batches': snapshot.batches})
+
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide pooled session for the LT API, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PAGE_FETCH_WORKERS * 2, pool_block=True)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def _get_page(url, page, headers):
+    response = get_session().get(f"{url}&limit={PAGE_LIMIT}&page={page}", headers=headers, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def iter_pages(url, token, workers=PAGE_FETCH_WORKERS):
+    """
+    Yield every item of a paginated LT list endpoint, in page order.
+
+    The page count comes from page 1 (``pageCount``, or ``total`` divided by
+    the page size); pages 2..N are fetched by up to ``workers`` threads, and
+    no more than ``workers`` pages are held ahead of the consumer. If the
+    response carries no page count, pages are read one by one until a short
+    page. Raises ``requests.RequestException`` while iterating if a page
+    cannot be read.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    first = _get_page(url, 1, headers)
+    items = first.get("data") or []
+    yield from items
+
+    page_count = first.get("pageCount")
+    if page_count is None and first.get("total") is not None:
+        page_count = -(-first["total"] // PAGE_LIMIT)
+    if page_count is None:
+        page = 1
+        while len(items) == PAGE_LIMIT:
+            page += 1
+            items = _get_page(url, page, headers).get("data") or []
+            yield from items
+        return
+    if page_count <= 1:
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= page_count:
+                while next_page <= page_count and len(pending) < workers:
+                    pending.append(executor.submit(_get_page, url, next_page, headers))
+                    next_page += 1
+                yield from pending.popleft().result().get("data") or []
+        finally:
+            # The consumer stopped early or a page failed: do not fetch pages nobody will read
+            for future in pending:
+                future.cancel()
+
+
+def fetch_batches(project_id, token):
+    """Read every batch of a project. Raises ``requests.RequestException`` on failure."""
+    return list(iter_pages(f"{BATCHES_URL}&filter%5B0%5D=projectId%7C%7C%24eq%7C%7C{project_id}", token))
+
+
+def iter_conversations(batch_id, token):
+    """Yield the conversations of a batch (see :func:`iter_pages` for errors)."""
+    return iter_pages(f"{CONVERSATIONS_URL}&filter%5B0%5D=batchId%7C%7C%24in%7C%7C{batch_id}", token)
+
+
+def get_project_batches(project_id, token, max_age=SNAPSHOT_TTL_SECONDS, refresh=False):
+    """
+    Return the :class:`ProjectBatches` snapshot of a project.
+
+    The first call in a run uses the on-disk snapshot if it is younger than
+    ``max_age``, otherwise fetches from the API; later calls reuse it from
+    memory. ``refresh=True`` always refetches. Raises
+    ``requests.RequestException`` if the API cannot be read.
+    """
+    with _project_lock(project_id):
+        snapshot = None if refresh else _SNAPSHOTS.get(project_id)
+        if snapshot is None and not refresh:
+            snapshot = _load_from_disk(project_id, max_age)
+            if snapshot is not None:
+                print(f"[Labeling Tool] Using batch snapshot for project {project_id} "
+                      f"({snapshot.age_seconds():.0f}s old, {len(snapshot.batches)} batches)")
+        if snapshot is None:
+            print(f"[Labeling Tool] Fetching batches for project {project_id}...")
+            snapshot = ProjectBatches(project_id, fetch_batches(project_id, token))
+            _save_to_disk(snapshot)
+        _SNAPSHOTS[project_id] = snapshot
+        return snapshot
+
+
+class ConversationIndex:
+    """
+    Repo name -> batch id -> PR ids for a set of LT projects.
+
+    Supports ``name in index`` over every batch name of the projects, like the
+    set of names it replaces. ``pr_ids`` is None when the conversations could
+    not be read, so callers can fall back to per-batch fetching.
+    """
+
+    def __init__(self, project_ids, repo_names, batches_by_repo, fetched_at=None, conversations_loaded=True):
+        self.project_ids = tuple(project_ids)
+        self.repo_names = frozenset(repo_names)
+        self.batches_by_repo = batches_by_repo  # USER__REPO -> {batch id: set of pr_id strings}
+        self.fetched_at = fetched_at or time.time()
+        self.conversations_loaded = conversations_loaded
+
+    def __contains__(self, name):
+        return name in self.repo_names
+
+    def __iter__(self):
+        return iter(self.repo_names)
+
+    def __len__(self):
+        return len(self.repo_names)
+
+    def pr_ids(self, lt_repo_name):
+        """Return the set of PR ids already in the LT for a ``USER__REPO`` batch name, or None."""
+        if not self.conversations_loaded:
+            return None
+        pr_ids = set()
+        for batch_pr_ids in self.batches_by_repo.get(lt_repo_name, {}).values():
+            pr_ids.update(batch_pr_ids)
+        return pr_ids
+
+    def pr_count(self):
+        return sum(len(ids) for batches in self.batches_by_repo.values() for ids in batches.values())
+
+    def to_payload(self):
+        return {
+            'fetched_at': self.fetched_at,
+            'project_ids': list(self.project_ids),
+            'repo_names': sorted(self.repo_names),
+            'batches_by_repo': {repo: {str(batch_id): sorted(ids) for batch_id, ids in batches.items()}
+                                for repo, batches in self.batches_by_repo.items()},
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        batches_by_repo = {repo: {batch_id: set(ids) for batch_id, ids in batches.items()}
+                           for repo, batches in payload['batches_by_repo'].items()}
+        return cls(payload['project_ids'], payload['repo_names'], batches_by_repo, payload['fetched_at'])
+
+
+def _conversation_index_path(project_ids):
+    return os.path.join(SNAPSHOT_DIR, f"conversations_{'_'.join(str(p) for p in project_ids)}.json")
+
+
+def iter_project_conversations(project_ids, token):
+    """Yield the conversations of every batch of the given projects (see :func:`iter_pages` for errors)."""
+    project_list = ",".join(str(project_id) for project_id in project_ids)
+    return iter_pages(f"{CONVERSATIONS_URL}&filter%5B0%5D=projectId%7C%7C%24in%7C%7C{project_list}", token)
+
+
+def build_conversation_index(project_ids, token, max_age=SNAPSHOT_TTL_SECONDS, refresh=False):
+    """
+    Build a :class:`ConversationIndex` for several projects at once.
+
+    Batch names come from the project snapshots, loaded concurrently; PR ids
+    come from one ``projectId $in`` conversation listing read with
+    :func:`iter_pages`. Projects whose batches cannot be read are skipped with
+    a message. A complete index is stored on disk and reused for ``max_age``
+    seconds unless ``refresh`` is set.
+    """
+    project_ids = tuple(sorted(project_ids))
+    path = _conversation_index_path(project_ids)
+    if not refresh:
+        stored = _read_stored(path, max_age)
+        if stored is not None:
+            index = ConversationIndex.from_payload(stored)
+            print(f"[Labeling Tool] Using conversation index for projects {list(project_ids)} "
+                  f"({time.time() - index.fetched_at:.0f}s old, {len(index)} batch names)")
+            return index
+
+    def load_snapshot(project_id):
+        try:
+            return get_project_batches(project_id, token, max_age=max_age, refresh=refresh)
+        except requests.exceptions.RequestException as e:
+            print(f"[Labeling Tool] Error fetching batches for project {project_id}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(len(project_ids), 1)) as executor:
+        snapshots = [snapshot for snapshot in executor.map(load_snapshot, project_ids) if snapshot]
+    repo_names = {name for snapshot in snapshots for name in snapshot.by_name}
+
+    print(f"[Labeling Tool] Fetching conversations for projects {list(project_ids)}...")
+    batches_by_repo = {}
+    conversations_loaded = True
+    try:
+        for conv in iter_project_conversations(project_ids, token):
+            batch = conv.get("batch") or {}
+            batch_name, batch_id = batch.get("name"), batch.get("id", conv.get("batchId"))
+            if not batch_name:
+                continue
+            pr_ids = batches_by_repo.setdefault(batch_name, {}).setdefault(batch_id, set())
+            pr_id = ((conv.get("seed") or {}).get("metadata") or {}).get("pr_id")
+            if pr_id:
+                pr_ids.add(str(pr_id))
+    except requests.exceptions.RequestException as e:
+        print(f"[Labeling Tool] Error fetching conversations for projects {list(project_ids)}: {e}")
+        conversations_loaded = False
+
+    index = ConversationIndex(project_ids, repo_names, batches_by_repo, conversations_loaded=conversations_loaded)
+    if conversations_loaded and len(snapshots) == len(project_ids):
+        _write_stored(path, index.to_payload())
+    return index
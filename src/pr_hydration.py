@@ -0,0 +1,70 @@
+"""
+Concurrent per-PR hydration for the REST fetch path.
+
+For every candidate PR the linked issue is fetched first, and the changed
+files only if the issue passes the caller's checks, so PRs rejected on their
+issue cost a single request. Many PRs are hydrated at once. An asyncio semaphore bounds
+how many PRs are in flight, and the blocking GitHub calls run on a dedicated
+thread pool. They still go through ``github_client``, so every request is
+paced by the shared rate-limit scheduler, which reads the rate-limit headers.
+Whenever the budget runs low the scheduler slows the workers down, so the
+concurrency here only sets an upper bound.
+
+Results are handed to a callback as they arrive, so filtering overlaps with
+the remaining network calls; callers that need a stable order keep the
+index passed to the callback.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from github_client import POOL_MAXSIZE
+
+DEFAULT_CONCURRENCY = 16  # PRs hydrated at once (each one runs up to two requests, one after the other)
+
+
+async def _hydrate_one(loop, executor, semaphore, index, item, fetch_issue, fetch_files, issue_passes):
+    pr, issue_number = item
+    async with semaphore:
+        issue = await loop.run_in_executor(executor, fetch_issue, issue_number)
+        files = []
+        if issue and issue_passes(issue):
+            files = await loop.run_in_executor(executor, fetch_files, pr['number'])
+    return index, issue, files
+
+
+async def _hydrate_all(items, fetch_issue, fetch_files, on_hydrated, concurrency, issue_passes):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    # One request in flight per PR; more threads than pooled connections would only queue on the pool
+    workers = max(1, min(concurrency, POOL_MAXSIZE))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pr-hydration") as executor:
+        tasks = [
+            asyncio.ensure_future(_hydrate_one(loop, executor, semaphore, index, item, fetch_issue, fetch_files,
+                                               issue_passes))
+            for index, item in enumerate(items)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, issue, files = await next_done
+                on_hydrated(index, items[index][0], items[index][1], issue, files)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def hydrate_prs(items, fetch_issue, fetch_files, on_hydrated, concurrency=DEFAULT_CONCURRENCY, issue_passes=None):
+    """
+    Fetch the linked issue and then the files of many PRs concurrently.
+
+    ``items`` is a list of ``(pr, issue_number)`` pairs. ``fetch_issue(issue_number)``
+    and ``fetch_files(pr_number)`` are blocking calls. Files are only fetched
+    when the issue was fetched and ``issue_passes(issue)`` is true; otherwise
+    ``files`` is ``[]``. As each PR completes,
+    ``on_hydrated(index, pr, issue_number, issue, files)`` is called on the
+    calling thread, where ``index`` is the position of the PR in ``items``.
+    """
+    if not items:
+        return
+    issue_passes = issue_passes or (lambda issue: True)
+    asyncio.run(_hydrate_all(items, fetch_issue, fetch_files, on_hydrated, max(1, concurrency), issue_passes))
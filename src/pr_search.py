@@ -0,0 +1,103 @@
+"""
+Merged-PR listing backend built on the issues search endpoint.
+
+``/repos/{owner}/{repo}/pulls?state=closed`` returns closed-but-unmerged PRs
+too and is sorted by ``updated``, so an old PR with a fresh comment keeps the
+walk going. Searching ``repo:o/r is:pr is:merged merged:A..B`` lets GitHub
+do the filtering instead. A search only exposes its first 1000 results, so
+the merge-date range is cut into windows. Any window that reports more than
+1000 hits is halved until each one fits. Windows and their pages are fetched
+concurrently; the ``search`` rate-limit budget is paced by the shared
+scheduler like every other request.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+
+from github_client import GITHUB_API_URL, github_get
+
+# --- Search Configuration ---
+SEARCH_URL = f"{GITHUB_API_URL}/search/issues"
+SEARCH_RESULT_CAP = 1000  # GitHub never returns more results than this for one query
+SEARCH_PAGE_SIZE = 100
+INITIAL_WINDOW_DAYS = 30  # The range is split into windows of this size up front
+SEARCH_WORKERS = 4
+
+
+def _format_ts(value):
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _build_query(owner, repo, start, end, updated_after=None):
+    query = f"repo:{owner}/{repo} is:pr is:merged merged:{_format_ts(start)}..{_format_ts(end)}"
+    if updated_after:
+        query += f" updated:>={_format_ts(updated_after)}"
+    return query
+
+
+def _search_page(query, page):
+    params = {"q": query, "per_page": SEARCH_PAGE_SIZE, "page": page, "sort": "updated", "order": "desc"}
+    return github_get(SEARCH_URL, params=params).json()
+
+
+def _normalize(item):
+    """Give a search hit the ``merged_at`` field the /pulls listing has."""
+    pr = dict(item)
+    pr["merged_at"] = (item.get("pull_request") or {}).get("merged_at") or item.get("closed_at")
+    return pr
+
+
+def _initial_windows(start, end):
+    windows = []
+    step = timedelta(days=INITIAL_WINDOW_DAYS)
+    while start < end:
+        window_end = min(start + step, end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(seconds=1)  # merged:A..B is inclusive on both ends
+    return windows
+
+
+def search_merged_prs(owner, repo, merged_after_date, updated_after=None):
+    """
+    Lists PRs merged after ``merged_after_date`` using the search API.
+    Returns PR dicts in the /pulls listing shape, most recently updated first.
+    """
+    print(f"📡 Searching merged PRs for {owner}/{repo}...")
+    start = merged_after_date + timedelta(seconds=1)  # The listing uses merged_at > cutoff
+    end = datetime.now(timezone.utc)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        pending = {}
+
+        def probe(window):
+            query = _build_query(owner, repo, window[0], window[1], updated_after)
+            pending[executor.submit(_search_page, query, 1)] = ("probe", window, query)
+
+        for window in _initial_windows(start, end):
+            probe(window)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, window, query = pending.pop(future)
+                data = future.result()
+                total = data.get("total_count", 0)
+                if kind == "probe" and total > SEARCH_RESULT_CAP and window[1] - window[0] > timedelta(seconds=1):
+                    # Too many hits to page through: split the window in half and probe both halves
+                    middle = window[0] + (window[1] - window[0]) / 2
+                    middle = middle.replace(microsecond=0)
+                    probe((window[0], middle))
+                    probe((middle + timedelta(seconds=1), window[1]))
+                    continue
+                for item in data.get("items", []):
+                    results[item["number"]] = _normalize(item)
+                if kind == "probe":
+                    pages = math.ceil(min(total, SEARCH_RESULT_CAP) / SEARCH_PAGE_SIZE)
+                    for page in range(2, pages + 1):
+                        pending[executor.submit(_search_page, query, page)] = ("page", window, query)
+
+    prs = sorted(results.values(), key=lambda pr: (pr.get("updated_at") or "", pr["number"]), reverse=True)
+    print(f"✅ Found {len(prs)} merged PRs since {merged_after_date.date()}.")
+    return prs
@@ -4,7 +4,9 @@ import time
 import csv
 import argparse
 from datetime import datetime
-from github import Github, GithubException, RateLimitExceededException
+from github import GithubException, RateLimitExceededException
+
+from github_client import get_pygithub_client
 
 # --- Configuration ---
 
@@ -120,7 +122,7 @@ def main(target_pr_count):
         return
 
     print("Initializing GitHub client...")
-    g = Github(GITHUB_TOKEN)
+    g = get_pygithub_client(GITHUB_TOKEN)
     
     results = []
     repo_toolchain_cache = {}
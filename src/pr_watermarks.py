@@ -0,0 +1,124 @@
+"""
+Persistent per-repository state for incremental merged-PR runs.
+
+For every repository analysed by ``agentic_pr_checker`` one small JSON file
+records:
+
+* ``watermark`` - the newest ``updated_at`` of any PR seen so far,
+* ``prs`` - every PR already classified by the logical filters, with the
+  trimmed PR data if it passed or ``None`` if it was rejected,
+* ``agent_decisions`` - the LLM verdicts already obtained.
+
+A rerun only lists PRs updated since the watermark, classifies those and
+merges them into the stored state, so the full report can still be written
+from the merged result. The state is tied to the ``MERGED_AFTER_DATE`` it was
+built with and is discarded if the cutoff changes.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+
+WATERMARK_DIR = os.path.join(os.path.dirname(__file__), '.cache', 'pr_watermarks')
+
+# PR fields kept in the state file; the full REST payload is much larger and unused downstream
+STORED_PR_FIELDS = (
+    'number', 'title', 'html_url', 'merged_at', 'updated_at', 'issue_number', 'issue_body', 'non_test_code_changes'
+)
+
+# Decisions with these comment prefixes came from failures and are retried on the next run
+FAILED_DECISION_PREFIXES = ('Error during processing', 'Exception:', 'LLM analysis failed')
+
+
+def _state_path(owner, repo):
+    return os.path.join(WATERMARK_DIR, f"{owner}__{repo}.json")
+
+
+def _empty_state(merged_after_date):
+    return {'merged_after': merged_after_date.isoformat(), 'watermark': None, 'prs': {}, 'agent_decisions': {}}
+
+
+def load_repo_state(owner, repo, merged_after_date):
+    """Load the stored state for a repo, or a fresh one if none exists or the cutoff date changed."""
+    try:
+        with open(_state_path(owner, repo), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _empty_state(merged_after_date)
+    if state.get('merged_after') != merged_after_date.isoformat():
+        return _empty_state(merged_after_date)
+    return state
+
+
+def save_repo_state(owner, repo, state):
+    """Write the state atomically so an interrupted run never leaves a truncated file."""
+    os.makedirs(WATERMARK_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=WATERMARK_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, _state_path(owner, repo))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_watermark(state):
+    """Return the watermark as a timezone-aware datetime, or None on the first run."""
+    if not state.get('watermark'):
+        return None
+    return datetime.fromisoformat(state['watermark'].replace('Z', '+00:00'))
+
+
+def merge_classified_prs(state, fetched_prs, relevant_prs, failed_numbers=(), advance_watermark=True):
+    """
+    Record the classification of freshly fetched PRs and advance the watermark.
+    ``fetched_prs`` are all PRs listed in this run, ``relevant_prs`` the ones that passed.
+    PRs in ``failed_numbers`` could not be classified (a fetch failed) and keep
+    whatever was stored before. With ``advance_watermark=False`` (an incomplete
+    listing or failed PRs) the watermark stays put, so the next run lists them again.
+    """
+    relevant_by_number = {str(pr['number']): pr for pr in relevant_prs}
+    failed_numbers = {str(number) for number in failed_numbers}
+    for pr in fetched_prs:
+        number = str(pr['number'])
+        if number in failed_numbers:
+            continue
+        passed = relevant_by_number.get(number)
+        previous = state['prs'].get(number)
+        if passed is None:
+            state['prs'][number] = None
+        else:
+            state['prs'][number] = {field: passed.get(field) for field in STORED_PR_FIELDS}
+        # A verdict is only reusable while the PR still points at the same issue
+        previous_issue = previous.get('issue_number') if previous else None
+        current_issue = passed.get('issue_number') if passed else None
+        if previous_issue != current_issue:
+            state['agent_decisions'].pop(number, None)
+
+        updated_at = pr.get('updated_at')
+        if advance_watermark and updated_at and (not state['watermark'] or
+                                                 datetime.fromisoformat(updated_at.replace('Z', '+00:00')) > get_watermark(state)):
+            state['watermark'] = updated_at
+
+
+def relevant_prs_from_state(state):
+    """Return every stored PR that passed the logical filters, most recently updated first."""
+    relevant = [pr for pr in state['prs'].values() if pr]
+    relevant.sort(key=lambda pr: (pr.get('updated_at') or '', pr['number']), reverse=True)
+    return relevant
+
+
+def get_agent_decisions(state):
+    """Return stored LLM decisions keyed by PR number (int)."""
+    return {int(number): decision for number, decision in state['agent_decisions'].items()}
+
+
+def record_agent_decisions(state, decisions):
+    """Store successful LLM decisions; failed ones are left out so they are retried."""
+    for number, decision in decisions.items():
+        if str(decision.get('comment', '')).startswith(FAILED_DECISION_PREFIXES):
+            continue
+        state['agent_decisions'][str(number)] = decision
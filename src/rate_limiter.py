@@ -0,0 +1,360 @@
+"""
+Process-wide GitHub rate-limit scheduler shared by all worker threads.
+
+Every response's ``X-RateLimit-Remaining``, ``X-RateLimit-Reset`` and
+``Retry-After`` headers are fed back into a per-token, per-resource budget
+(``core``, ``search``, ``graphql``). Before a request is sent the caller
+acquires a slot and is told which token to send it with:
+
+* When several tokens are configured, each request goes to the token with
+  the most headroom; a token that runs dry is simply skipped until its reset.
+* While more than ``PACE_BELOW_FRACTION`` of a token's hourly limit is left,
+  requests go out immediately.
+* Below that, a token bucket spreads the remaining budget evenly over the
+  time left until reset, so the limit is approached but never hit.
+* A ``Retry-After`` (secondary rate limit) blocks that token's resource.
+* Waiting callers are served in priority order; ``PRIORITY_INTERACTIVE``
+  (single-repo / debug runs) may also spend the small reserve that
+  ``PRIORITY_BULK`` (sheet runs) leaves untouched.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+from config_utils import get_github_tokens
+
+# --- Priority Classes ---
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_BULK: 'bulk'}
+
+# --- Scheduler Configuration ---
+PACE_BELOW_FRACTION = 0.5  # Start pacing once less than half the hourly budget is left
+RESERVE_FRACTION = 0.05  # Part of the budget only interactive callers may spend
+BURST = 10  # Requests that may go out back-to-back while pacing
+THROUGHPUT_WINDOW = 60.0  # Seconds of history used to project exhaustion time
+MAX_WAIT_SLICE = 1.0  # Waiters re-check the budget at least this often
+
+
+def resource_for_url(url):
+    """Map a GitHub API URL to the rate-limit resource it is billed against."""
+    path = urlparse(url).path
+    if path.startswith('/search/'):
+        return 'search'
+    if path.startswith('/graphql'):
+        return 'graphql'
+    return 'core'
+
+
+class _Bucket:
+    """Budget state for one token and rate-limit resource. All access happens under the scheduler lock."""
+
+    def __init__(self, resource, label):
+        self.resource = resource
+        self.label = label
+        self.limit = None
+        self.remaining = None  # Last value reported by GitHub for the current window
+        self.reset_at = None
+        self.blocked_until = 0.0
+        self.inflight = 0  # Requests sent but not yet reported back
+        self.tokens = float(BURST)
+        self.last_refill = time.time()
+        self.recent = deque()
+
+    def effective_remaining(self):
+        if self.remaining is None:
+            return None
+        return self.remaining - self.inflight
+
+    def headroom(self, priority):
+        """Requests this token may still spend at ``priority``; unknown budgets count as unlimited."""
+        remaining = self.effective_remaining()
+        if remaining is None:
+            return math.inf
+        if priority == PRIORITY_INTERACTIVE or not self.limit:
+            return remaining
+        return remaining - int(self.limit * RESERVE_FRACTION)
+
+    def delay_for(self, now, priority):
+        """Seconds until a request of the given priority may be sent; 0 means now."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.reset_at is not None and now >= self.reset_at:
+            # The window rolled over; trust the fresh budget until a response says otherwise
+            self.remaining = self.limit
+            self.reset_at = None
+
+        usable = self.headroom(priority)
+        if usable <= 0:
+            return (self.reset_at - now) if self.reset_at else MAX_WAIT_SLICE
+
+        remaining = self.effective_remaining()
+        if remaining is None or not self.limit or self.reset_at is None or remaining > self.limit * PACE_BELOW_FRACTION:
+            self.tokens = float(BURST)
+            self.last_refill = now
+            return 0.0
+
+        rate = usable / max(self.reset_at - now, 1.0)
+        self.tokens = min(float(BURST), self.tokens + (now - self.last_refill) * rate)
+        self.last_refill = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / rate
+
+    def consume(self, now):
+        self.tokens = max(self.tokens - 1, 0.0)
+        self.inflight += 1
+        self.recent.append(now)
+        self._trim(now)
+
+    def _trim(self, now):
+        while self.recent and now - self.recent[0] > THROUGHPUT_WINDOW:
+            self.recent.popleft()
+
+    def throughput(self, now):
+        """Requests per second over the recent window."""
+        self._trim(now)
+        return len(self.recent) / THROUGHPUT_WINDOW
+
+    def status(self, now):
+        remaining = self.effective_remaining()
+        rate = self.throughput(now)
+        projected = None
+        if remaining is not None and rate > 0:
+            projected = now + max(remaining, 0) / rate
+        return {
+            'token': self.label,
+            'limit': self.limit,
+            'remaining': remaining,
+            'reset_at': self.reset_at,
+            'blocked_until': self.blocked_until if self.blocked_until > now else None,
+            'inflight': self.inflight,
+            'requests_per_second': rate,
+            'projected_exhaustion': projected,
+        }
+
+
+class RateLimitScheduler:
+    """Paces GitHub requests across threads and tokens using the budget GitHub reports back."""
+
+    def __init__(self, tokens=None):
+        self._cond = threading.Condition()
+        self._tokens = []
+        self._labels = {}
+        self._buckets = {}
+        self._waiters = {}
+        self._seq = itertools.count()
+        if tokens:
+            self.set_tokens(tokens)
+
+    def set_tokens(self, tokens):
+        """Register the tokens requests may be spread across. Existing budgets are kept."""
+        with self._cond:
+            for token in tokens:
+                if token not in self._labels:
+                    self._tokens.append(token)
+                    self._labels[token] = f"token{len(self._tokens)}" if token else 'anonymous'
+            self._cond.notify_all()
+
+    def token_count(self):
+        with self._cond:
+            return len(self._tokens)
+
+    def _bucket(self, token, resource):
+        bucket = self._buckets.get((token, resource))
+        if bucket is None:
+            label = self._labels.get(token, 'token?')
+            bucket = self._buckets[(token, resource)] = _Bucket(resource, label)
+        return bucket
+
+    def _pick(self, resource, priority, now):
+        """
+        Return ``(token, 0)`` for the ready token with the most headroom, or
+        ``(None, delay)`` with the shortest wait if every token is throttled.
+        """
+        best_token, best_key, shortest = None, None, math.inf
+        for token in self._tokens:
+            bucket = self._bucket(token, resource)
+            delay = bucket.delay_for(now, priority)
+            if delay > 0:
+                shortest = min(shortest, delay)
+                continue
+            key = (bucket.headroom(priority), -bucket.inflight)
+            if best_key is None or key > best_key:
+                best_token, best_key = token, key
+        if best_token is not None:
+            return best_token, 0.0
+        return None, shortest
+
+    def acquire(self, resource='core', priority=None):
+        """
+        Block until a request against ``resource`` may be sent, reserve it and
+        return the token to send it with.
+        """
+        if priority is None:
+            priority = get_current_priority()
+        with self._cond:
+            waiters = self._waiters.setdefault(resource, [])
+            ticket = (priority, next(self._seq))
+            heapq.heappush(waiters, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    if waiters[0] == ticket:
+                        token, delay = self._pick(resource, priority, now)
+                        if token is not None:
+                            heapq.heappop(waiters)
+                            self._bucket(token, resource).consume(now)
+                            self._cond.notify_all()
+                            return token
+                        self._cond.wait(timeout=min(delay, MAX_WAIT_SLICE))
+                    else:
+                        self._cond.wait(timeout=MAX_WAIT_SLICE)
+            except BaseException:
+                if ticket in waiters:
+                    waiters.remove(ticket)
+                    heapq.heapify(waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self, token, resource='core', headers=None):
+        """
+        Report the outcome of a request acquired with :meth:`acquire`.
+        ``headers`` are the response headers, or None if no response arrived.
+        """
+        now = time.time()
+        with self._cond:
+            bucket = self._bucket(token, resource)
+            bucket.inflight = max(bucket.inflight - 1, 0)
+            if headers:
+                self._apply_headers(bucket, headers, now)
+            self._cond.notify_all()
+
+    def _apply_headers(self, bucket, headers, now):
+        try:
+            limit = int(headers.get('X-RateLimit-Limit'))
+            remaining = int(headers.get('X-RateLimit-Remaining'))
+            reset_at = float(headers.get('X-RateLimit-Reset'))
+        except (TypeError, ValueError):
+            limit = remaining = reset_at = None
+
+        if remaining is not None:
+            bucket.limit = limit
+            if bucket.remaining is None or bucket.reset_at is None or reset_at != bucket.reset_at:
+                bucket.remaining = remaining  # New window
+            else:
+                # Responses can arrive out of order; within a window the budget only shrinks
+                bucket.remaining = min(bucket.remaining, remaining)
+            bucket.reset_at = reset_at
+
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                bucket.blocked_until = max(bucket.blocked_until, now + float(retry_after))
+            except ValueError:
+                pass
+
+    def status(self):
+        """
+        Return, per resource, the budget summed over all tokens, the queue
+        depth, the projected exhaustion time and a per-token breakdown.
+        """
+        now = time.time()
+        with self._cond:
+            resources = {resource for _, resource in self._buckets}
+            result = {}
+            for resource in resources:
+                per_token = [self._bucket(token, resource).status(now) for token in self._tokens]
+                known = [info for info in per_token if info['remaining'] is not None]
+                remaining = sum(max(info['remaining'], 0) for info in known) if known else None
+                rate = sum(info['requests_per_second'] for info in per_token)
+                resets = [info['reset_at'] for info in known if info['reset_at']]
+                result[resource] = {
+                    'resource': resource,
+                    'limit': sum(info['limit'] or 0 for info in known) if known else None,
+                    'remaining': remaining,
+                    'reset_at': min(resets) if resets else None,
+                    'queue_depth': len(self._waiters.get(resource, [])),
+                    'requests_per_second': rate,
+                    'projected_exhaustion': now + remaining / rate if remaining is not None and rate > 0 else None,
+                    'tokens': per_token,
+                }
+            return result
+
+
+def format_status(status):
+    """Render :meth:`RateLimitScheduler.status` output as a single log line."""
+    parts = []
+    for resource, info in sorted(status.items()):
+        if info['remaining'] is None:
+            parts.append(f"{resource}: unknown budget, queue {info['queue_depth']}")
+            continue
+        reset = datetime.fromtimestamp(info['reset_at']).strftime('%H:%M:%S') if info['reset_at'] else '?'
+        projected = info['projected_exhaustion']
+        if projected is None:
+            exhaustion = "not projected"
+        elif info['reset_at'] and projected >= info['reset_at']:
+            exhaustion = "not before reset"
+        else:
+            exhaustion = f"exhausted ~{datetime.fromtimestamp(projected).strftime('%H:%M:%S')}"
+        tokens = f" across {len(info['tokens'])} tokens" if len(info['tokens']) > 1 else ""
+        parts.append(f"{resource}: {info['remaining']}/{info['limit']} left{tokens} (reset {reset}), "
+                     f"queue {info['queue_depth']}, {info['requests_per_second']:.2f} req/s, {exhaustion}")
+    return "; ".join(parts) if parts else "no GitHub requests yet"
+
+
+# --- Priority Handling ---
+
+_DEFAULT_PRIORITY = PRIORITY_BULK
+_THREAD_STATE = threading.local()
+
+
+def set_default_priority(priority):
+    """Set the priority used by threads that have not entered a :func:`priority_scope`."""
+    global _DEFAULT_PRIORITY
+    _DEFAULT_PRIORITY = priority
+
+
+def get_current_priority():
+    return getattr(_THREAD_STATE, 'priority', _DEFAULT_PRIORITY)
+
+
+@contextmanager
+def priority_scope(priority):
+    """Run the enclosed GitHub calls of the current thread at ``priority``."""
+    previous = getattr(_THREAD_STATE, 'priority', None)
+    _THREAD_STATE.priority = priority
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _THREAD_STATE.priority
+        else:
+            _THREAD_STATE.priority = previous
+
+
+_SCHEDULER = RateLimitScheduler()
+
+
+def get_scheduler():
+    """
+    Return the process-wide scheduler, registering the configured tokens on
+    first use. Without any token a single anonymous slot (``''``) is used,
+    which github_client sends without an Authorization header.
+    """
+    if _SCHEDULER.token_count() == 0:
+        _SCHEDULER.set_tokens(get_github_tokens() or [''])
+    return _SCHEDULER
+
+
+def get_rate_limit_status():
+    """Current budget, queue depth and projected exhaustion time per resource."""
+    return _SCHEDULER.status()
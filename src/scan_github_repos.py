@@ -1,12 +1,14 @@
 import os
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from github import Github, GithubException, RateLimitExceededException
+from github import GithubException, RateLimitExceededException
 import pandas as pd
 from datetime import datetime
 import time
 import argparse
 
+from github_client import get_pygithub_client
+
 # --- Configuration ---
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
 SHEET_ID = '1XMbstebCi1xFSwJ7cTN-DXv4jFmdH2owWBE3R7YsXK0'
@@ -60,11 +62,11 @@ def authenticate_google_sheets():
     return client
 
 def get_github_client():
-    """Returns an authenticated GitHub client using environment variable."""
+    """Returns an authenticated GitHub client backed by the shared transport settings."""
     github_token = os.getenv('GITHUB_TOKEN')
     if not github_token:
         raise ValueError("GITHUB_TOKEN environment variable not set.")
-    return Github(github_token)
+    return get_pygithub_client(github_token)
 
 def has_modern_toolchain(repo, language, cache):
     """
@@ -0,0 +1,88 @@
+"""
+Lookup indexes over the repo sheet, built once per run.
+
+``evaluate_repo`` and ``preprocess_duplicates`` used to scan and normalise
+whole DataFrame columns for every repo, which is O(rows) per lookup.
+:class:`SheetIndex` walks the sheet once after ``fetch_sheet_data`` and keeps:
+
+* normalised repo URL -> DataFrame row indices (in sheet order),
+* the rows whose "Added" column says "Yes".
+
+DataFrame index ``i`` is sheet row ``i + 2`` (0-based index plus the header row).
+
+The duplicate and resume passes of ``logical_repo_checks.main`` are column
+operations (:func:`mark_duplicates`, :func:`unprocessed_row_indices`) rather
+than ``iterrows`` loops. :func:`mark_duplicates` returns exactly the cells it
+changed, so the sheet write is a diff. ``benchmarks/bench_preprocess_duplicates.py``
+compares them with the row-by-row versions on a synthetic sheet.
+"""
+
+
+def normalize_url(url):
+    """Normalise a repo URL for comparison (case and surrounding whitespace are ignored)."""
+    return url.strip().lower() if isinstance(url, str) else ''
+
+
+class SheetIndex:
+    """Row indexes over a sheet DataFrame produced by fetch_sheet_data."""
+
+    def __init__(self, df, column_indices):
+        self.rows_by_url = {}
+        self.added_rows = set()
+
+        def column(key):
+            name = f"col_{column_indices[key]}"
+            return df[name].tolist() if name in df.columns else [''] * len(df)
+
+        for index, url, added in zip(df.index, column('repo_url'), column('added')):
+            url = normalize_url(url)
+            if url:
+                self.rows_by_url.setdefault(url, []).append(index)
+            if isinstance(added, str) and added.strip().lower() == 'yes':
+                self.added_rows.add(index)
+
+    def is_added(self, url):
+        """True if any row with this URL is marked "Yes" in the Added column."""
+        return any(index in self.added_rows for index in self.rows_by_url.get(normalize_url(url), ()))
+
+
+def _normalized_column(df, column_indices, key):
+    """Return a column as stripped, lower-cased strings ('' for missing cells)."""
+    return df[f"col_{column_indices[key]}"].fillna('').astype(str).str.strip().str.lower()
+
+
+def mark_duplicates(df, column_indices, existing_lt_repos):
+    """
+    Mark rows whose repo is already in the labeling tool, and every repeat of
+    a repo URL after its first occurrence, as Already Exists = "Yes" and
+    Logical Checks = "No".
+
+    Returns ``(marked_df, lt_mask, duplicate_mask, changed_cells)`` where
+    ``changed_cells`` lists the ``(row, col, value)`` cells (1-based) whose
+    value actually changed.
+    """
+    urls = _normalized_column(df, column_indices, 'repo_url')
+    repos = _normalized_column(df, column_indices, 'user_repo')
+
+    lt_mask = repos.str.contains('/', regex=False) & repos.isin(set(existing_lt_repos))
+    duplicate_mask = urls.duplicated(keep='first') & (urls != '')
+    marked = lt_mask | duplicate_mask
+
+    marked_df = df.copy()
+    changed_cells = []
+    for key, value in (('already_exists', 'Yes'), ('logical_checks', 'No')):
+        name = f"col_{column_indices[key]}"
+        changed = marked & (df[name] != value)
+        marked_df.loc[marked, name] = value
+        changed_cells.extend((index + 2, column_indices[key] + 1, value) for index in df.index[changed])
+    changed_cells.sort()
+    return marked_df, lt_mask, duplicate_mask, changed_cells
+
+
+def unprocessed_row_indices(df, column_indices):
+    """Return the indices of rows with a ``user/repo`` value and an empty Logical Checks cell."""
+    user_repos = df[f"col_{column_indices['user_repo']}"]
+    logical_checks = df[f"col_{column_indices['logical_checks']}"]
+    has_repo = user_repos.map(lambda value: isinstance(value, str)) & user_repos.astype(str).str.contains('/', regex=False)
+    is_empty = logical_checks.isna() | (logical_checks.astype(str).str.strip() == '')
+    return df.index[has_repo & is_empty].tolist()
@@ -0,0 +1,65 @@
+"""
+Per-thread buffering of console output for concurrent workers.
+
+When many repos are evaluated at once, their ``print`` lines would interleave
+into an unreadable stream. While :class:`ThreadOutput` is active,
+``sys.stdout`` is replaced by a proxy. Text printed inside a
+:meth:`ThreadOutput.capture` block goes into a buffer that belongs to the
+calling thread. Output from any other thread passes straight through. The
+worker returns its buffer and the caller prints it as one block once the
+work is done.
+"""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
+
+class ThreadOutput:
+    """Context manager that lets worker threads capture their own stdout."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._stream = None
+        self._write_lock = threading.Lock()
+
+    def __enter__(self):
+        self._stream = sys.stdout
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *exc):
+        sys.stdout = self._stream
+        return False
+
+    @contextmanager
+    def capture(self):
+        """Buffer everything the current thread prints; yields the buffer."""
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def emit(self, text):
+        """Write a finished block to the real stdout without interleaving."""
+        with self._write_lock:
+            self._stream.write(text)
+            self._stream.flush()
+
+    # --- file-like interface used by print() ---
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        with self._write_lock:
+            return self._stream.write(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
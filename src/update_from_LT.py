@@ -21,6 +21,7 @@ SPREADSHEET_KEY = get_spreadsheet_key()
 # --- Labeling Tool Configuration ---
 from config_utils import get_lt_token
 LT_TOKEN = get_lt_token()
+from lt_client import get_project_batches
 
 # --- Sheet Configuration ---
 # Configure which sheets to update and their corresponding project IDs
@@ -164,39 +165,19 @@ def fetch_all_batches_from_lt(project_id):
     """
     Fetches all batch data from the labeling tool API for a specific project.
     Returns a dictionary mapping USER__REPO to batch data.
+    The batch stats are copied into the sheet, so the snapshot is always
+    refreshed from the API rather than reused from disk.
     """
-    base_url = f"https://eval.turing.com/api/batches?sort%5B0%5D=createdAt%2CDESC&join%5B0%5D=batchStats&join%5B1%5D=importAttempts&filter%5B0%5D=projectId%7C%7C%24eq%7C%7C{project_id}"
-    headers = {"Authorization": f"Bearer {LT_TOKEN}"}
-    all_batches = []
-    page = 1
-    limit = 100
-
     print(f"\n[Labeling Tool] Fetching all batch data for project ID: {project_id}...")
 
-    while True:
-        paginated_url = f"{base_url}&limit={limit}&page={page}"
-        try:
-            response = requests.get(paginated_url, headers=headers)
-            response.raise_for_status()
-            json_data = response.json()
-            batches_on_page = json_data.get("data")
-            if not batches_on_page:
-                break
-            all_batches.extend(batches_on_page)
-            if len(batches_on_page) < limit:
-                break
-            page += 1
-        except requests.exceptions.RequestException as e:
-            print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
-            return {}
+    try:
+        snapshot = get_project_batches(project_id, LT_TOKEN, refresh=True)
+    except requests.exceptions.RequestException as e:
+        print(colored(f"Error fetching batches from labeling tool: {e}", "red"))
+        return {}
 
-    # Create a dictionary mapping USER__REPO to batch data
-    batch_data = {}
-    for batch in all_batches:
-        if batch is not None:  # Ensure batch is not None
-            batch_name = batch.get("name", "")
-            if batch_name and "__" in batch_name:
-                batch_data[batch_name] = batch
+    # Dictionary mapping USER__REPO to batch data
+    batch_data = snapshot.repo_batches()
 
     print(f"[Labeling Tool] Found {len(batch_data)} batches with valid names")
     return batch_data
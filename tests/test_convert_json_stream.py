@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+pytest.importorskip('requests')
+from convert import iter_json_array  # noqa: E402
+
+# Read sizes from a single character up, so elements and the closing bracket straddle chunk boundaries
+CHUNK_SIZES = (1, 2, 3, 7, 64, 1 << 20)
+
+
+def write(tmp_path, text):
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('text', ['[]', ' [ ] \n', '[\n]'])
+def test_empty_array(tmp_path, text, chunk_size):
+    assert list(iter_json_array(write(tmp_path, text), chunk_size)) == []
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_strings_with_brackets_and_commas(tmp_path, chunk_size):
+    records = [{'body': 'a ], b', 'title': '[x, y]'}, ']', ',', {'nested': [[1, 2], {'k': '}]'}]}, 12345]
+    text = json.dumps(records, indent=2) + '\n'
+    assert list(iter_json_array(write(tmp_path, text), chunk_size)) == records
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_large_elements_split_across_chunks(tmp_path, chunk_size):
+    records = [{'id': i, 'text': 'x' * 500} for i in range(50)]
+    assert list(iter_json_array(write(tmp_path, json.dumps(records)), chunk_size)) == records
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('text', ['[1,]', '[1, ]', '[,1]', '[1,,2]', '[1 2]'])
+def test_misplaced_commas_are_rejected(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text), chunk_size))
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('text', ['[1] x', '[1]]', '[1],', '[1][2]', '[1', '{"a": 1}', ''])
+def test_malformed_documents_are_rejected(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text), chunk_size))
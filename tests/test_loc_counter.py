@@ -0,0 +1,61 @@
+import io
+import os
+import sys
+import tarfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from loc_counter import count_code_lines, count_lines_in_directory, count_lines_in_tar_stream  # noqa: E402
+
+
+def test_block_comment_opened_after_code():
+    assert count_code_lines("int a; /* x\nstill comment\n*/ int b;", 'Java') == 2
+
+
+def test_comments_only_lines_are_skipped():
+    text = "/* a */ int x; /* b\n c */\n// d\nint y; // e\n\n  /* one */  \n"
+    assert count_code_lines(text, 'Java') == 2
+
+
+def test_python_docstring_and_inline_comment():
+    text = 'def f():\n    """doc\n    more"""\n    return 1  # hi\n'
+    assert count_code_lines(text, 'Python') == 2
+
+
+def test_comment_openers_inside_strings_are_code():
+    text = 'const glob = "src/**/*.js";\nconst x = 1;\nconst url = \'http://a\'; // c\n'
+    assert count_code_lines(text, 'JavaScript') == 3
+
+
+# Relative path -> contents of a small repo; vendor/, the root build/ and the .min.js file are skipped
+TREE = {
+    'main.py': 'import os\n\n# comment\nprint(os.sep)\n',
+    'src/gen/parser.py': 'x = 1\ny = 2\n',
+    'pkg/build/rules.py': 'z = 3\n',
+    'build/out.py': 'skipped = True\n',
+    'vendor/lib.py': 'skipped = True\n',
+    'web/app.min.js': 'skipped();\n',
+    'README.md': 'not source\n',
+}
+
+
+def test_directory_walk(tmp_path):
+    for name, content in TREE.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    result = count_lines_in_directory(str(tmp_path))
+    assert result == {'total': 5, 'languages': {'Python': 5}, 'files': 3}
+
+
+def test_tar_stream_matches_directory_walk():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for name, content in TREE.items():
+            data = content.encode()
+            info = tarfile.TarInfo(f"owner-repo-abc1234/{name}")  # GitHub's top-level directory
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    result = count_lines_in_tar_stream(buffer)
+    assert result == {'total': 5, 'languages': {'Python': 5}, 'files': 3}
@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from pr_watermarks import _empty_state, merge_classified_prs  # noqa: E402
+
+CUTOFF = datetime(2024, 11, 1, tzinfo=timezone.utc)
+
+
+def pr(number, updated_at, issue_number=None):
+    return {'number': number, 'updated_at': updated_at, 'issue_number': issue_number, 'title': f"PR {number}"}
+
+
+def stored_state():
+    state = _empty_state(CUTOFF)
+    state['watermark'] = '2025-01-01T00:00:00Z'
+    state['prs'] = {
+        '1': {'number': 1, 'updated_at': '2024-12-01T00:00:00Z', 'issue_number': '10'},
+        '2': None,
+        '3': {'number': 3, 'updated_at': '2024-12-02T00:00:00Z', 'issue_number': '30'},
+    }
+    state['agent_decisions'] = {'1': {'result': 'Good PR'}, '3': {'result': 'Bad PR'}}
+    return state
+
+
+def test_failed_prs_keep_their_previous_verdict():
+    state = stored_state()
+    fetched = [pr(1, '2025-02-01T00:00:00Z'), pr(2, '2025-02-01T00:00:00Z')]
+    merge_classified_prs(state, fetched, [], failed_numbers=[1, 2])
+    assert state['prs']['1']['issue_number'] == '10'
+    assert state['prs']['2'] is None
+    assert state['agent_decisions']['1'] == {'result': 'Good PR'}
+
+
+def test_updated_prs_replace_relevant_and_rejected_verdicts():
+    state = stored_state()
+    fetched = [pr(1, '2025-02-01T00:00:00Z'), pr(2, '2025-02-02T00:00:00Z'),
+               pr(3, '2025-02-03T00:00:00Z', issue_number='30')]
+    relevant = [pr(2, '2025-02-02T00:00:00Z', issue_number='20'), pr(3, '2025-02-03T00:00:00Z', issue_number='30')]
+    merge_classified_prs(state, fetched, relevant)
+
+    assert state['prs']['1'] is None  # Relevant before, rejected now
+    assert '1' not in state['agent_decisions']
+    assert state['prs']['2']['issue_number'] == '20'  # Rejected before, relevant now
+    assert state['prs']['3']['updated_at'] == '2025-02-03T00:00:00Z'
+    assert state['agent_decisions']['3'] == {'result': 'Bad PR'}  # Same issue: the verdict is kept
+
+
+def test_watermark_only_moves_when_allowed():
+    state = stored_state()
+    fetched = [pr(4, '2025-03-01T00:00:00Z')]
+    merge_classified_prs(state, fetched, [], advance_watermark=False)
+    assert state['watermark'] == '2025-01-01T00:00:00Z'
+    assert state['prs']['4'] is None
+
+    merge_classified_prs(state, fetched, [], advance_watermark=True)
+    assert state['watermark'] == '2025-03-01T00:00:00Z'
+
+    merge_classified_prs(state, [pr(5, '2025-02-01T00:00:00Z')], [])
+    assert state['watermark'] == '2025-03-01T00:00:00Z'  # Never moves backwards
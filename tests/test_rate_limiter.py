@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import rate_limiter  # noqa: E402
+from rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, RateLimitScheduler  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def budget_headers(clock, remaining, limit=5000, reset_in=3600):
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(int(clock.now + reset_in)),
+    }
+
+
+def test_exhausted_token_is_skipped_until_reset(clock):
+    scheduler = RateLimitScheduler(['a', 'b'])
+    token = scheduler.acquire()
+    assert token == 'a'
+    scheduler.release(token, headers=budget_headers(clock, remaining=0))
+
+    assert scheduler.acquire() == 'b'
+    scheduler.release('b', headers=budget_headers(clock, remaining=0))
+    token, delay = scheduler._pick('core', PRIORITY_BULK, clock.now)
+    assert token is None and delay == pytest.approx(3600)
+
+    clock.now += 3601  # Both windows roll over
+    assert scheduler.acquire() in ('a', 'b')
+
+
+def test_retry_after_blocks_the_resource(clock):
+    scheduler = RateLimitScheduler(['a'])
+    scheduler.release(scheduler.acquire(), headers={'Retry-After': '30'})
+    token, delay = scheduler._pick('core', PRIORITY_BULK, clock.now)
+    assert token is None and delay == pytest.approx(30)
+    # Other resources of the same token are not blocked
+    assert scheduler._pick('search', PRIORITY_BULK, clock.now) == ('a', 0.0)
+
+    clock.now += 31
+    assert scheduler.acquire() == 'a'
+
+
+def test_reserve_is_left_to_interactive_callers(clock):
+    scheduler = RateLimitScheduler(['a'])
+    scheduler.release(scheduler.acquire(), headers=budget_headers(clock, remaining=3, limit=100))
+    assert scheduler._pick('core', PRIORITY_BULK, clock.now)[0] is None
+    assert scheduler._pick('core', PRIORITY_INTERACTIVE, clock.now) == ('a', 0.0)
+
+
+def test_waiters_are_served_in_priority_order(clock, monkeypatch):
+    scheduler = RateLimitScheduler(['a'])
+    scheduler.release(scheduler.acquire(), headers={'Retry-After': '30'})
+
+    served = []
+    original_consume = rate_limiter._Bucket.consume
+
+    def recording_consume(bucket, now):
+        served.append(threading.current_thread().name)
+        original_consume(bucket, now)
+
+    monkeypatch.setattr(rate_limiter._Bucket, 'consume', recording_consume)
+
+    def wait(priority):
+        scheduler.acquire(priority=priority)
+
+    threads = [threading.Thread(target=wait, args=(PRIORITY_BULK,), name='bulk')]
+    threads[0].start()
+    while len(scheduler._waiters.get('core', [])) < 1:
+        time.sleep(0.01)
+    threads.append(threading.Thread(target=wait, args=(PRIORITY_INTERACTIVE,), name='interactive'))
+    threads[1].start()
+    while len(scheduler._waiters.get('core', [])) < 2:
+        time.sleep(0.01)
+
+    clock.now += 31  # Lift the block; the interactive waiter goes first although it queued last
+    with scheduler._cond:
+        scheduler._cond.notify_all()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert served == ['interactive', 'bulk']
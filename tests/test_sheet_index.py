@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sheet_index import mark_duplicates, unprocessed_row_indices  # noqa: E402
+
+COLUMN_INDICES = {'user_repo': 0, 'repo_url': 1, 'already_exists': 2, 'logical_checks': 3}
+
+# user/repo, repo URL, Already Exists, Logical Checks (strings, as get_all_values returns them)
+ROWS = [
+    ['a/one', 'https://github.com/a/one', '', ''],
+    ['A/One', ' HTTPS://github.com/a/one ', '', ''],  # Repeat of row 0 up to case and whitespace
+    ['b/two', 'https://github.com/b/two', 'No', 'Yes'],
+    ['lt/repo', 'https://github.com/lt/repo', '', ''],  # In the labeling tool
+    [' LT/Repo ', 'https://github.com/lt/repo-fork', 'Yes', 'No'],  # In the labeling tool, already marked
+    ['lt', '', '', ''],  # No '/', so never matched against the labeling tool
+    ['c/three', '', '', 'Manual'],
+    ['d/four', '', '', ''],  # Empty URLs are never duplicates of each other
+    ['b/two', 'https://github.com/b/two', 'Yes', 'No'],  # Repeat that is already marked
+]
+EXISTING_LT_REPOS = {'lt/repo', 'lt'}
+
+
+def make_df():
+    return pd.DataFrame(ROWS, columns=[f"col_{i}" for i in range(4)])
+
+
+def row_by_row(df):
+    """The previous iterrows implementation: returns (lt rows, duplicate rows, changed cells, unprocessed rows)."""
+    seen_urls = set()
+    lt_rows, duplicate_rows, changed_cells, unprocessed = [], [], [], []
+    for index, row in df.iterrows():
+        user_repo, url, already_exists, logical_checks = (row[f"col_{i}"] for i in range(4))
+        is_lt = '/' in user_repo.strip() and user_repo.strip().lower() in EXISTING_LT_REPOS
+        normalized_url = url.strip().lower()
+        is_duplicate = normalized_url != '' and normalized_url in seen_urls
+        seen_urls.add(normalized_url)
+        if is_lt:
+            lt_rows.append(index)
+        if is_duplicate:
+            duplicate_rows.append(index)
+        if is_lt or is_duplicate:
+            if already_exists != 'Yes':
+                changed_cells.append((index + 2, 3, 'Yes'))
+            if logical_checks != 'No':
+                changed_cells.append((index + 2, 4, 'No'))
+            logical_checks = 'No'
+        if '/' in user_repo.strip() and logical_checks.strip() == '':
+            unprocessed.append(index)
+    return lt_rows, duplicate_rows, sorted(changed_cells), unprocessed
+
+
+def test_mark_duplicates_matches_row_by_row():
+    df = make_df()
+    lt_rows, duplicate_rows, expected_cells, expected_unprocessed = row_by_row(df)
+    marked_df, lt_mask, duplicate_mask, changed_cells = mark_duplicates(df, COLUMN_INDICES, EXISTING_LT_REPOS)
+
+    assert df.index[lt_mask].tolist() == lt_rows == [3, 4]
+    assert df.index[duplicate_mask].tolist() == duplicate_rows == [1, 8]
+    assert changed_cells == expected_cells
+    assert unprocessed_row_indices(marked_df, COLUMN_INDICES) == expected_unprocessed == [0, 7]
+    assert df.equals(make_df())  # The input DataFrame is left untouched
+
+
+def test_unchanged_sheet_produces_no_cells():
+    df = make_df()
+    marked_df, _, _, _ = mark_duplicates(df, COLUMN_INDICES, EXISTING_LT_REPOS)
+    assert mark_duplicates(marked_df, COLUMN_INDICES, EXISTING_LT_REPOS)[3] == []